@@ -22,7 +22,8 @@ class LLMClient:
         messages: List[Dict[str, str]],
         stream: bool = True,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        stop: Optional[List[str]] = None
     ) -> Iterator[str]:
         """
         Send a chat request to OpenRouter API
@@ -32,6 +33,7 @@ class LLMClient:
             stream: Whether to stream the response
             temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum tokens to generate
+            stop: Optional stop sequences that end generation server-side
             
         Yields:
             Text chunks as they arrive from the API
@@ -54,6 +56,9 @@ class LLMClient:
         if max_tokens:
             payload["max_tokens"] = max_tokens
         
+        if stop:
+            payload["stop"] = stop
+        
         try:
             # Make streaming request
             response = requests.post(
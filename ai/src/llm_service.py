@@ -269,7 +269,13 @@ class LLMService:
             }
         }
 
-    def _query_llm(self, user_message: str, context_messages: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+    def _query_llm(
+        self,
+        user_message: str,
+        context_messages: Optional[List[Dict[str, str]]] = None,
+        max_tokens: Optional[int] = None,
+        stop: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """Query the LLM - now used internally by LLMCommandParser"""
         # Build messages list
         messages = []
@@ -283,7 +289,7 @@ class LLMService:
         messages.append({"role": "user", "content": user_message})
         
         # Get streaming response
-        stream = self.llm_client.chat(messages)
+        stream = self.llm_client.chat(messages, max_tokens=max_tokens, stop=stop)
         
         return {
             "type": "llm",
@@ -308,7 +314,13 @@ class LLMService:
         """Get conversation history"""
         return self.conversation_history.copy()
     
-    def query_llm(self, prompt: str, context_messages: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+    def query_llm(
+        self,
+        prompt: str,
+        context_messages: Optional[List[Dict[str, str]]] = None,
+        max_tokens: Optional[int] = None,
+        stop: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Directly query the LLM without classification
         Useful for code generation, project creation, etc.
@@ -316,11 +328,13 @@ class LLMService:
         Args:
             prompt: The prompt to send to LLM
             context_messages: Optional conversation context
+            max_tokens: Optional cap on generated tokens
+            stop: Optional stop sequences
             
         Returns:
             Dict with LLM response stream
         """
-        return self._query_llm(prompt, context_messages)
+        return self._query_llm(prompt, context_messages, max_tokens=max_tokens, stop=stop)
 
 
 # Global singleton instance
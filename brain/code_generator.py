@@ -6,24 +6,195 @@ Generates code for new functionality using LLM
 import sys
 import json
 import re
+import time
+import hashlib
+import importlib.util
+import threading
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Iterable, Tuple
 
-# Add ai module to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "ai" / "src"))
+try:
+    import ijson  # Optional: parse the JSON answer while it streams in
+except ImportError:
+    ijson = None
+
+# LLM service module, loaded by file location on first use so importing this
+# module doesn't mutate sys.path
+_LLM_SERVICE_PATH = Path(__file__).parent.parent / "ai" / "src" / "llm_service.py"
+
+# Persistent cache of validated generations, one JSON file per request hash
+CODEGEN_CACHE_DIR = Path.home() / ".fluffy" / "codegen_cache"
+CODEGEN_CACHE_TTL = 30 * 24 * 60 * 60  # 30 days, in seconds
+
+# Output token budget for generation: base + per-parameter allowance, capped
+_TOKEN_BUDGET_BASE = 400
+_TOKEN_BUDGET_PER_PARAM = 120
+_TOKEN_BUDGET_MAX = 2048
+
+# Sequences that can only follow the closing brace of the JSON answer
+_STOP_SEQUENCES = ["```\n\n", "</json>"]
+
+# Prompt templates, pre-split around their variable slots so each build is a
+# single str.join instead of a full f-string re-render.
+_PROMPT_HEAD = "Generate Python code for a new Fluffy command capability.\n\nIntent Name: "
+_PROMPT_MID1 = "\nDescription: "
+_PROMPT_MID2 = "\nParameters: "
+_PROMPT_TAIL = """
+
+Generate the following code blocks:
+
+1. **Intent Enum Entry** - Constant name for the intent
+   Format: descriptive string (e.g. "RENAME_FILES")
+
+2. **Regex Patterns** - List of strings
+   Example: ["rename\\s+(.+)", "change\\s+names\\s+in\\s+(.+)"]
+
+4. **Executor Method** - Complete Python method for CommandExecutor.
+   Template:
+   ```python
+   def execute(self, command: Command) -> Dict[str, Any]:
+       \"\"\"Brief description\"\"\"
+       try:
+           # Get params from command.parameters
+           param1 = command.parameters.get("name")
+           # Logic here (use os, shutil, etc.)
+           return {"success": True, "message": "Success message"}
+       except Exception as e:
+           return {"success": False, "message": f"Error: {str(e)}"}
+   ```
+
+5. **Validation Logic** - Python code for ActionValidator.
+   Template:
+   ```python
+   def validate(self, command: Command):
+       \"\"\"Brief description\"\"\"
+       if command.intent.value == "intent_name":
+           return ValidationResult(is_valid=True, safety_level=SafetyLevel.SAFE, message="Safe")
+       return None
+   ```
+
+Return your response as a SINGLE JSON OBJECT. 
+CRITICAL: NO NOT use "self.extract_parameters" or "self.validate_folder". Use "command.parameters" and standard library calls.
+CRITICAL: All Python code blocks MUST be escape-encoded as JSON strings (escape backslashes, double quotes, and newlines).
+
+JSON Structure:
+{
+    "intent_enum": "DESCRIPTIVE_NAME",
+    "patterns": ["pattern1"],
+    "parameter_extraction": "Python code...",
+    "executor_method": "def execute(self, command): ...",
+    "validation": "Python code...",
+    "description": "brief description"
+}
+
+Make the code:
+- Production-ready with error handling
+- Well-commented
+- Following Fluffy's existing code style
+- Safe and secure (no arbitrary code execution)
+
+Generate code for: """
+
+_FIX_HEAD = "The Python code you generated has syntax errors. Please fix them.\n\nIntent: "
+_FIX_MID1 = "\nDescription: "
+_FIX_MID2 = """
+
+**Instructions:**
+1. Fix ALL syntax errors
+2. Ensure proper string escaping (use triple quotes for multi-line strings)
+3. Balance all quotes, parentheses, and braces
+4. Return the COMPLETE corrected code in the same JSON format
+
+Return JSON:
+{
+    "intent_enum": \""""
+_FIX_MID3 = '",\n    "patterns": '
+_FIX_MID4 = """,
+    "executor_method": "FIXED executor code here",
+    "validation": "FIXED validation code here",
+    "description": \""""
+_FIX_TAIL = """"
+}
+
+CRITICAL: Escape all special characters properly in JSON strings.
+"""
+
+
+def _format_fix_error(label: str, error: Dict[str, Any], code: str) -> str:
+    """Render one error block of the fix prompt"""
+    return "".join((
+        "\n**", label, " Code Error:**\n- Error: ", str(error['error']),
+        "\n- Line: ", str(error['line']),
+        "\n- Suggestion: ", str(error['suggestion']),
+        "\n\n", label, " Code:\n```python\n", code, "\n```\n"
+    ))
+
+
+class _StreamReader:
+    """
+    Read-only, file-like bytes view over an LLM chunk stream for ijson.
+    Skips any preamble (e.g. a ```json fence) up to the first '{' and keeps
+    every raw chunk seen so the text parser can take over on failure.
+    """
+    
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+        self._started = False
+        self.consumed: List[str] = []
+    
+    def read(self, size: int = -1) -> bytes:
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b""
+            self.consumed.append(chunk)
+            if not self._started:
+                start = chunk.find("{")
+                if start == -1:
+                    continue
+                chunk = chunk[start:]
+                self._started = True
+            self._buffer = chunk
+        
+        if size is None or size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data.encode("utf-8")
+    
+    def drain(self) -> str:
+        """Consume the rest of the stream and return all raw text seen"""
+        self.consumed.extend(self._chunks)
+        return "".join(self.consumed)
 
 
 class GeneratedCode:
     """Container for generated code blocks"""
-    
+
+    __slots__ = (
+        "intent_name",
+        "intent_enum",
+        "patterns",
+        "parameter_extraction",
+        "executor_method",
+        "validation",
+        "description",
+    )
+
     def __init__(self, data: Dict[str, Any]):
-        self.intent_name = data.get("intent_name", "")
-        self.intent_enum = data.get("intent_enum", "")
-        self.patterns = data.get("patterns", [])
-        self.parameter_extraction = data.get("parameter_extraction", "")
-        self.executor_method = data.get("executor_method", "")
-        self.validation = data.get("validation_method", data.get("validation", ""))
-        self.description = data.get("description", "")
+        get = data.get
+        self.intent_name = get("intent_name", "")
+        self.intent_enum = get("intent_enum", "")
+        self.patterns = get("patterns", [])
+        self.parameter_extraction = get("parameter_extraction", "")
+        self.executor_method = get("executor_method", "")
+        self.validation = get("validation_method") or get("validation", "")
+        self.description = get("description", "")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form, as accepted by __init__"""
+        return {name: getattr(self, name) for name in self.__slots__}
     
     def __repr__(self):
         return f"GeneratedCode(intent={self.intent_name})"
@@ -32,18 +203,33 @@ class GeneratedCode:
 class CodeGenerator:
     """Generate code for new functionality using LLM"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None, cache_ttl: float = CODEGEN_CACHE_TTL):
+        """
+        Args:
+            cache_dir: Directory for cached generations (default: ~/.fluffy/codegen_cache)
+            cache_ttl: Seconds before a cached generation expires
+        """
         self.llm = None  # Lazy load
+        self._llm_lock = threading.Lock()
+        self.cache_dir = Path(cache_dir) if cache_dir else CODEGEN_CACHE_DIR
+        self.cache_ttl = cache_ttl
     
     def _get_llm(self):
-        """Lazy load LLM service"""
+        """Lazy load LLM service (double-checked so concurrent callers share one handle)"""
         if self.llm is None:
-            try:
-                from llm_service import get_service
-                self.llm = get_service()
-            except Exception as e:
-                print(f"[CodeGenerator] Failed to load LLM service: {e}")
-                self.llm = None
+            with self._llm_lock:
+                if self.llm is None:
+                    try:
+                        module = sys.modules.get("llm_service")
+                        if module is None:
+                            spec = importlib.util.spec_from_file_location("llm_service", _LLM_SERVICE_PATH)
+                            module = importlib.util.module_from_spec(spec)
+                            spec.loader.exec_module(module)
+                            sys.modules["llm_service"] = module
+                        self.llm = module.get_service()
+                    except Exception as e:
+                        print(f"[CodeGenerator] Failed to load LLM service: {e}")
+                        self.llm = None
         return self.llm
     
     def generate_intent_handler(
@@ -51,7 +237,8 @@ class CodeGenerator:
         intent_name: str,
         description: str,
         parameters: Dict[str, Any],
-        max_retries: int = 3
+        max_retries: int = 3,
+        use_cache: bool = True
     ) -> GeneratedCode:
         """
         Generate all code needed for a new intent with automatic validation and fixing
@@ -61,11 +248,20 @@ class CodeGenerator:
             description: What this intent does
             parameters: Parameters needed for this intent
             max_retries: Maximum attempts to fix syntax errors (default: 3)
+            use_cache: Reuse/store validated code in the on-disk cache (default: True)
             
         Returns:
             GeneratedCode object with all necessary code blocks, or None if failed
         """
         
+        cache_path = None
+        if use_cache:
+            cache_path = self._cache_path(intent_name, description, parameters)
+            cached = self._load_cached(cache_path)
+            if cached is not None:
+                print(f"[CodeGenerator] ✓ Using cached code for '{intent_name}'")
+                return cached
+        
         llm = self._get_llm()
         if not llm:
             return self._generate_fallback_code(intent_name, description, parameters)
@@ -73,6 +269,12 @@ class CodeGenerator:
         # Import validator
         from brain.code_validator import validate_extension_code
         
+        # Cap output size by input complexity so the LLM stops once the JSON closes
+        budget = min(
+            _TOKEN_BUDGET_MAX,
+            _TOKEN_BUDGET_BASE + _TOKEN_BUDGET_PER_PARAM * len(parameters or {})
+        )
+        
         # Try generating and validating code
         for attempt in range(max_retries):
             try:
@@ -85,17 +287,22 @@ class CodeGenerator:
                     prompt = self._build_fix_prompt(generated, validation_result, intent_name, description)
                 
                 # Query LLM
-                result = llm.query_llm(prompt)
+                result = llm.query_llm(prompt, max_tokens=budget, stop=_STOP_SEQUENCES)
                 
-                # Collect streaming response
-                full_response = ""
-                for chunk in result["stream"]:
-                    full_response += chunk
+                # Parse the response as it streams in when ijson is available,
+                # otherwise collect it and parse the full text
+                generated = None
+                if ijson is not None:
+                    generated, full_response = self._stream_generated_code(
+                        result["stream"], intent_name, description
+                    )
+                else:
+                    full_response = "".join(result["stream"])
                 
                 print(f"[CodeGenerator] Generated {len(full_response)} chars of code")
                 
-                # Parse response
-                generated = self._parse_generated_code(full_response, intent_name, description)
+                if generated is None:
+                    generated = self._parse_generated_code(full_response, intent_name, description)
                 
                 # Validate the generated code
                 validation_result = validate_extension_code(
@@ -105,6 +312,8 @@ class CodeGenerator:
                 
                 if validation_result["valid"]:
                     print(f"[CodeGenerator] ✓ Code validation passed!")
+                    if cache_path is not None:
+                        self._store_cached(cache_path, generated)
                     return generated
                 else:
                     # Log validation errors
@@ -132,6 +341,39 @@ class CodeGenerator:
         
         return None
     
+    def _cache_path(
+        self,
+        intent_name: str,
+        description: str,
+        parameters: Dict[str, Any]
+    ) -> Path:
+        """Cache file for a generation request"""
+        key_src = f"{intent_name}|{description}|{json.dumps(parameters, sort_keys=True, default=str)}"
+        key = hashlib.sha256(key_src.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json"
+    
+    def _load_cached(self, cache_path: Path) -> Optional[GeneratedCode]:
+        """Load a cached generation, or None if missing, expired or unreadable"""
+        try:
+            if time.time() - cache_path.stat().st_mtime > self.cache_ttl:
+                return None
+            with cache_path.open("r", encoding="utf-8") as f:
+                return GeneratedCode(json.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[CodeGenerator] Ignoring unreadable cache entry {cache_path.name}: {e}")
+            return None
+    
+    def _store_cached(self, cache_path: Path, generated: GeneratedCode):
+        """Persist a validated generation"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with cache_path.open("w", encoding="utf-8") as f:
+                json.dump(generated.to_dict(), f, indent=2)
+        except Exception as e:
+            print(f"[CodeGenerator] Failed to write cache entry: {e}")
+    
     def _build_generation_prompt(
         self,
         intent_name: str,
@@ -140,68 +382,12 @@ class CodeGenerator:
     ) -> str:
         """Build prompt for code generation"""
         
-        prompt = f"""Generate Python code for a new Fluffy command capability.
-
-Intent Name: {intent_name}
-Description: {description}
-Parameters: {json.dumps(parameters, indent=2)}
-
-Generate the following code blocks:
-
-1. **Intent Enum Entry** - Constant name for the intent
-   Format: descriptive string (e.g. "RENAME_FILES")
-
-2. **Regex Patterns** - List of strings
-   Example: ["rename\\s+(.+)", "change\\s+names\\s+in\\s+(.+)"]
-
-4. **Executor Method** - Complete Python method for CommandExecutor.
-   Template:
-   ```python
-   def execute(self, command: Command) -> Dict[str, Any]:
-       \"\"\"Brief description\"\"\"
-       try:
-           # Get params from command.parameters
-           param1 = command.parameters.get("name")
-           # Logic here (use os, shutil, etc.)
-           return {{"success": True, "message": "Success message"}}
-       except Exception as e:
-           return {{"success": False, "message": f"Error: {{str(e)}}"}}
-   ```
-
-5. **Validation Logic** - Python code for ActionValidator.
-   Template:
-   ```python
-   def validate(self, command: Command):
-       \"\"\"Brief description\"\"\"
-       if command.intent.value == "intent_name":
-           return ValidationResult(is_valid=True, safety_level=SafetyLevel.SAFE, message="Safe")
-       return None
-   ```
-
-Return your response as a SINGLE JSON OBJECT. 
-CRITICAL: NO NOT use "self.extract_parameters" or "self.validate_folder". Use "command.parameters" and standard library calls.
-CRITICAL: All Python code blocks MUST be escape-encoded as JSON strings (escape backslashes, double quotes, and newlines).
-
-JSON Structure:
-{{
-    "intent_enum": "DESCRIPTIVE_NAME",
-    "patterns": ["pattern1"],
-    "parameter_extraction": "Python code...",
-    "executor_method": "def execute(self, command): ...",
-    "validation": "Python code...",
-    "description": "brief description"
-}}
-
-Make the code:
-- Production-ready with error handling
-- Well-commented
-- Following Fluffy's existing code style
-- Safe and secure (no arbitrary code execution)
-
-Generate code for: {intent_name}
-"""
-        
-        return prompt
+        return "".join((
+            _PROMPT_HEAD, intent_name,
+            _PROMPT_MID1, description,
+            _PROMPT_MID2, json.dumps(parameters, indent=2),
+            _PROMPT_TAIL, intent_name, "\n"
+        ))
     
     def _build_fix_prompt(
         self,
@@ -216,57 +402,61 @@ Generate code for: {intent_name}
         errors = []
         if not validation_result["handler_valid"]:
             error = validation_result["handler_error"]
-            errors.append(f"""
-**Handler Code Error:**
-- Error: {error['error']}
-- Line: {error['line']}
-- Suggestion: {error['suggestion']}
-
-Handler Code:
-```python
-{generated_code.executor_method}
-```
-""")
+            errors.append(_format_fix_error("Handler", error, generated_code.executor_method))
         
         if not validation_result["validator_valid"]:
             error = validation_result["validator_error"]
-            errors.append(f"""
-**Validator Code Error:**
-- Error: {error['error']}
-- Line: {error['line']}
-- Suggestion: {error['suggestion']}
-
-Validator Code:
-```python
-{generated_code.validation}
-```
-""")
+            errors.append(_format_fix_error("Validator", error, generated_code.validation))
         
-        prompt = f"""The Python code you generated has syntax errors. Please fix them.
-
-Intent: {intent_name}
-Description: {description}
-
-{''.join(errors)}
-
-**Instructions:**
-1. Fix ALL syntax errors
-2. Ensure proper string escaping (use triple quotes for multi-line strings)
-3. Balance all quotes, parentheses, and braces
-4. Return the COMPLETE corrected code in the same JSON format
-
-Return JSON:
-{{
-    "intent_enum": "{generated_code.intent_enum}",
-    "patterns": {json.dumps(generated_code.patterns)},
-    "executor_method": "FIXED executor code here",
-    "validation": "FIXED validation code here",
-    "description": "{description}"
-}}
-
-CRITICAL: Escape all special characters properly in JSON strings.
-"""
-        return prompt
+        return "".join((
+            _FIX_HEAD, intent_name,
+            _FIX_MID1, description,
+            "\n\n", *errors,
+            _FIX_MID2, generated_code.intent_enum,
+            _FIX_MID3, json.dumps(generated_code.patterns),
+            _FIX_MID4, description,
+            _FIX_TAIL
+        ))
+    
+    def _stream_generated_code(
+        self,
+        stream: Iterable[str],
+        intent_name: str,
+        description: str
+    ) -> Tuple[Optional[GeneratedCode], str]:
+        """
+        Incrementally parse the LLM's JSON answer with ijson, returning as soon
+        as the top-level object closes instead of waiting for trailing tokens.
+        
+        Returns:
+            (GeneratedCode or None if streaming parse failed, raw text consumed)
+        """
+        reader = _StreamReader(stream)
+        builder = ijson.ObjectBuilder()
+        
+        try:
+            for prefix, event, value in ijson.parse(reader):
+                builder.event(event, value)
+                if prefix == "" and event == "end_map":
+                    break
+            else:
+                raise ValueError("JSON object not closed")
+            
+            data = builder.value
+            if not isinstance(data, dict):
+                raise ValueError("Response is not a JSON object")
+        except Exception as e:
+            print(f"[CodeGenerator] Streaming parse failed, using text parser: {e}")
+            return None, reader.drain()
+        
+        # Release the rest of the stream (and its connection) early
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+        
+        data["intent_name"] = intent_name
+        data["description"] = description
+        return GeneratedCode(data), "".join(reader.consumed)
     
     def _parse_generated_code(
         self,
@@ -281,6 +471,9 @@ CRITICAL: Escape all special characters properly in JSON strings.
             if "```json" in response:
                 json_start = response.find("```json") + 7
                 json_end = response.find("```", json_start)
+                if json_end == -1:
+                    # Closing fence was cut by a stop sequence
+                    json_end = len(response)
                 json_str = response[json_start:json_end].strip()
             elif "{" in response:
                 json_start = response.find("{")
@@ -364,14 +557,12 @@ CRITICAL: Escape all special characters properly in JSON strings.
         })
 
 
-# Global singleton
-_code_generator = None
+# Global singleton (built eagerly - construction is cheap and the LLM
+# handle itself stays lazy inside _get_llm, so no lock is needed here)
+_code_generator = CodeGenerator()
 
 def get_code_generator() -> CodeGenerator:
-    """Get or create the global CodeGenerator instance"""
-    global _code_generator
-    if _code_generator is None:
-        _code_generator = CodeGenerator()
+    """Get the global CodeGenerator instance"""
     return _code_generator
 
 
@@ -392,7 +583,8 @@ if __name__ == "__main__":
         parameters={
             "url": "URL to download from",
             "destination": "Where to save the file"
-        }
+        },
+        use_cache="--no-cache" not in sys.argv
     )
     
     print(f"\nGenerated Code:")
@@ -4,10 +4,63 @@ Validates Python code syntax and provides detailed error information
 """
 
 import ast
+import atexit
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
 from typing import Dict, Any
 
 
+# Shared read-only results for the two constant outcomes
+_VALID_RESULT = MappingProxyType({
+    "valid": True,
+    "error": None,
+    "error_type": None,
+    "line": None,
+    "column": None,
+    "suggestion": None
+})
+
+_EMPTY_CODE_RESULT = MappingProxyType({
+    "valid": False,
+    "error": "Code is empty",
+    "error_type": "EmptyCode",
+    "line": None,
+    "column": None,
+    "suggestion": "Provide valid Python code"
+})
+
+# Statement placed between handler and validator for the fused parse; if it
+# survives as a top-level node, neither block leaked into the other
+_FUSE_SENTINEL = "__fluffy_validator_split__"
+_FUSE_JOINER = f"\n\n{_FUSE_SENTINEL} = None\n\n"
+
+# Above this size (in characters) the handler and validator are parsed in
+# parallel worker processes; below it the IPC cost outweighs the gain.
+PARALLEL_PARSE_THRESHOLD = 2048
+
+# Shared parser pool, created on first large validation and shut down at exit
+_parser_pool = None
+
+
+def _get_parser_pool() -> ProcessPoolExecutor:
+    """Get or create the shared parser process pool"""
+    global _parser_pool
+    if _parser_pool is None:
+        _parser_pool = ProcessPoolExecutor(max_workers=2)
+        atexit.register(_shutdown_parser_pool)
+    return _parser_pool
+
+
+def _shutdown_parser_pool():
+    """Stop the parser worker processes; the next large validation starts a new pool"""
+    global _parser_pool
+    pool, _parser_pool = _parser_pool, None
+    if pool is not None:
+        atexit.unregister(_shutdown_parser_pool)
+        pool.shutdown(wait=True)
+
+
 def validate_python_code(code: str, filename: str = "<generated>") -> Dict[str, Any]:
     """
     Validate Python code syntax using AST parsing
@@ -25,28 +78,15 @@ def validate_python_code(code: str, filename: str = "<generated>") -> Dict[str,
             "column": int or None,
             "suggestion": str or None
         }
+        The valid and empty-code results are shared read-only mappings.
     """
     if not code or not code.strip():
-        return {
-            "valid": False,
-            "error": "Code is empty",
-            "error_type": "EmptyCode",
-            "line": None,
-            "column": None,
-            "suggestion": "Provide valid Python code"
-        }
+        return _EMPTY_CODE_RESULT
     
     try:
         # Try to parse the code
         ast.parse(code, filename=filename)
-        return {
-            "valid": True,
-            "error": None,
-            "error_type": None,
-            "line": None,
-            "column": None,
-            "suggestion": None
-        }
+        return _VALID_RESULT
     except SyntaxError as e:
         # Extract detailed error information
         error_type = type(e).__name__
@@ -77,6 +117,30 @@ def validate_python_code(code: str, filename: str = "<generated>") -> Dict[str,
         }
 
 
+def _fused_parse_ok(handler_code: str, validator_code: str) -> bool:
+    """
+    Parse handler and validator as one module (one tokenizer pass).
+    True only if the combined source parses and the separator statement is
+    still a top-level node, i.e. both blocks are valid on their own.
+    """
+    try:
+        tree = ast.parse(handler_code + _FUSE_JOINER + validator_code)
+    except Exception:
+        return False
+    
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id == _FUSE_SENTINEL):
+            return True
+    return False
+
+
+def _validate_in_worker(code: str, filename: str) -> Dict[str, Any]:
+    """Pool entry point - returns a plain dict since the shared results don't pickle"""
+    return dict(validate_python_code(code, filename))
+
+
 def _get_suggestion(error_msg: str, error_type: str) -> str:
     """Generate helpful suggestion based on error type"""
     
@@ -119,8 +183,39 @@ def validate_extension_code(handler_code: str, validator_code: str) -> Dict[str,
             "validator_error": dict or None
         }
     """
-    handler_result = validate_python_code(handler_code, filename="handler.py")
-    validator_result = validate_python_code(validator_code, filename="validator.py")
+    handler_result = validator_result = None
+    large = max(len(handler_code or ""), len(validator_code or "")) > PARALLEL_PARSE_THRESHOLD
+    
+    # Fast path: both blocks valid, checked in a single parse. Errors are
+    # attributed by the separate parses below.
+    if (not large and handler_code and handler_code.strip()
+            and validator_code and validator_code.strip()
+            and _fused_parse_ok(handler_code, validator_code)):
+        return {
+            "valid": True,
+            "handler_valid": True,
+            "validator_valid": True,
+            "handler_error": None,
+            "validator_error": None
+        }
+    
+    if large:
+        try:
+            pool = _get_parser_pool()
+            handler_future = pool.submit(_validate_in_worker, handler_code, "handler.py")
+            validator_future = pool.submit(_validate_in_worker, validator_code, "validator.py")
+            handler_result = handler_future.result()
+            validator_result = validator_future.result()
+        except Exception as e:
+            # Pool unavailable (e.g. frozen app, broken worker) - parse inline,
+            # and drop the pool so a broken one isn't reused
+            print(f"[CodeValidator] Parallel parse failed, falling back: {e}")
+            handler_result = validator_result = None
+            _shutdown_parser_pool()
+    
+    if handler_result is None or validator_result is None:
+        handler_result = validate_python_code(handler_code, filename="handler.py")
+        validator_result = validate_python_code(validator_code, filename="validator.py")
     
     return {
         "valid": handler_result["valid"] and validator_result["valid"],
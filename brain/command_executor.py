@@ -3,12 +3,83 @@ Command Executor - Executes validated voice commands
 Integrates with Rust core for actual file operations
 """
 
-import requests
-from typing import Dict, Any, Optional
+import re
+import shutil
+import subprocess
+import time
+import traceback
+import urllib.parse
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple
 from brain.command_parser import Command, Intent
 from brain.action_validator import ValidationResult, SafetyLevel
 from brain import platform_utils
 
+try:
+    import pyautogui
+except Exception:  # Not installed, or no display available (headless Linux)
+    pyautogui = None
+
+# Filename sanitizers shared by research and project creation
+_SAFE_NAME_RE = re.compile(r'[^\w\s-]')
+_WS_RUN_RE = re.compile(r'[-\s]+')
+
+# Persistent workers that absorb process-creation latency for app launches
+_SPAWN_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fluffy-spawn")
+
+
+# Static execute() responses; frozen so the shared templates can't be edited.
+# Callers get plain dicts because results are JSON-serialized by the web API.
+_UNKNOWN_RESPONSE = MappingProxyType({
+    "success": False,
+    "message": "I didn't quite get that. Type 'help' to see what I can do!",
+    "action": "error"
+})
+_BLOCKED_SKELETON = MappingProxyType({
+    "success": False,
+    "action": "blocked"
+})
+
+
+def _spawn_app(path: str):
+    """Launch an app detached from Fluffy (runs on _SPAWN_POOL)."""
+    try:
+        if platform_utils.IS_WINDOWS:
+            subprocess.Popen([path], close_fds=True, creationflags=subprocess.DETACHED_PROCESS)
+        else:
+            subprocess.Popen([path], close_fds=True, start_new_session=True)
+    except Exception as e:
+        # Cached path may be stale (app moved/uninstalled)
+        platform_utils.clear_app_cache()
+        print(f"[CommandExecutor] Failed to launch {path}: {e}")
+
+
+_HELP_TEXT = (
+    "Here's what I can help you with:\n\n"
+    "🚀 **App Management**\n"
+    "- 'open [app name]'\n"
+    "- 'close [app name]'\n"
+    "- 'kill process [name]'\n\n"
+    "📁 **File Operations**\n"
+    "- 'create file [name] in [desktop/documents/downloads]'\n"
+    "- 'create folder [name] in [location]'\n"
+    "- 'delete file [name] from [location]'\n\n"
+    "🌐 **Web & Research**\n"
+    "- 'search for [query]'\n"
+    "- 'research [topic] and save'\n\n"
+    "⚙️ **System**\n"
+    "- 'lock', 'shutdown', 'restart'\n\n"
+    "Just type or say a command to get started!"
+)
+_HELP_RESPONSE = {
+    "success": True,
+    "message": _HELP_TEXT,
+    "action": "info"
+}
+
 
 class CommandExecutor:
     """
@@ -19,6 +90,39 @@ class CommandExecutor:
     
     def __init__(self):
         self.rust_core_url = "http://127.0.0.1:9002"  # Rust command server
+        # Plugin singletons, resolved on first use and reused afterwards
+        self._loader = None
+        self._session = None
+        self._improver = None
+        self._generator = None
+    
+    def _get_loader(self):
+        if self._loader is None:
+            from brain.extension_loader import get_extension_loader
+            self._loader = get_extension_loader()
+        return self._loader
+    
+    def _get_session(self):
+        # Imported lazily: importing session memory initializes long-term
+        # memory on disk, which merely importing the executor shouldn't do
+        if self._session is None:
+            from brain.memory.session_memory import get_session_memory
+            self._session = get_session_memory()
+        return self._session
+    
+    def _get_improver(self):
+        # Imported lazily: self_improver pulls in the LLM stack, which in turn
+        # constructs a CommandExecutor
+        if self._improver is None:
+            from brain.self_improver import get_self_improver
+            self._improver = get_self_improver()
+        return self._improver
+    
+    def _get_generator(self):
+        if self._generator is None:
+            from brain.project_generator import get_generator
+            self._generator = get_generator()
+        return self._generator
     
     def execute(self, command: Command, validation: ValidationResult) -> Dict[str, Any]:
         """
@@ -32,17 +136,12 @@ class CommandExecutor:
             Execution result with success status and message
         """
         if not validation.is_valid:
-            return {
-                "success": False,
-                "message": validation.message,
-                "action": "blocked"
-            }
+            return {**_BLOCKED_SKELETON, "message": validation.message}
         
         if validation.safety_level == SafetyLevel.NEEDS_CONFIRMATION:
             # Save to session memory so user can confirm
             try:
-                from brain.memory.session_memory import get_session_memory
-                session = get_session_memory()
+                session = self._get_session()
                 # Mark validation as confirmed so it can execute
                 confirmed_validation = ValidationResult(
                     is_valid=True,
@@ -59,53 +158,14 @@ class CommandExecutor:
                 "command": command.raw_text
             }
         
-        # Execute based on intent
-        if command.intent == Intent.OPEN_APP:
-            return self._execute_open_app(command)
-        
-        elif command.intent == Intent.CLOSE_APP:
-            return self._execute_close_app(command)
-        
-        elif command.intent == Intent.CREATE_FILE:
-            return self._execute_create_file(command)
-        
-        elif command.intent == Intent.CREATE_FOLDER:
-            return self._execute_create_folder(command)
-        
-        elif command.intent == Intent.DELETE_FILE:
-            return self._execute_delete_file(command)
-        
-        elif command.intent == Intent.DELETE_FOLDER:
-            return self._execute_delete_folder(command)
-        
-        elif command.intent == Intent.SYSTEM_COMMAND:
-            return self._execute_system_command(command)
-        
-        elif command.intent == Intent.KILL_PROCESS:
-            return self._execute_kill_process(command)
-        
-        elif command.intent == Intent.TYPE_TEXT:
-            return self._type_text(
-                command.parameters.get("text", ""),
-                command.parameters.get("target_app")
-            )
-        
-        elif command.intent == Intent.CREATE_PROJECT:
-            return self._execute_create_project(command)
-        
-        elif command.intent == Intent.RESEARCH:
-            return self._execute_research(command)
-        
-        elif command.intent == Intent.HELP:
-            return self._execute_help(command)
-        
-        elif command.intent == Intent.CHAT:
-            return self._execute_chat(command)
+        # Execute based on intent (jump table built at the end of the class)
+        handler = self._INTENT_DISPATCH.get(command.intent)
+        if handler is not None:
+            return handler(self, command)
         
         # Try extensions (plugin system)
         try:
-            from brain.extension_loader import get_extension_loader
-            loader = get_extension_loader()
+            loader = self._get_loader()
             
             if loader.has_extension(command.intent.value):
                 return loader.execute(command, validation)
@@ -115,17 +175,12 @@ class CommandExecutor:
         # Unknown command - try self-improvement
         if command.intent == Intent.UNKNOWN:
             try:
-                from brain.self_improver import get_self_improver
-                improver = get_self_improver()
+                improver = self._get_improver()
                 return improver.handle_unknown_command(command.original_text)
             except Exception as e:
                 print(f"[CommandExecutor] Self-improver error: {e}")
         
-        return {
-            "success": False,
-            "message": "I didn't quite get that. Type 'help' to see what I can do!",
-            "action": "error"
-        }
+        return dict(_UNKNOWN_RESPONSE)
     
     def _execute_chat(self, command: Command) -> Dict[str, Any]:
         """Handle conversational queries using LLM response"""
@@ -148,17 +203,19 @@ class CommandExecutor:
     
     def _execute_open_app(self, command: Command) -> Dict[str, Any]:
         """Execute app launch command"""
-        import subprocess
-        import os
-        
         app_name = command.parameters.get("app_name", "")
         
         # Use platform-aware app discovery
         app_path = platform_utils.find_app_executable(app_name)
+        if app_path and not Path(app_path).exists():
+            # Cached path may be stale (app moved/uninstalled)
+            platform_utils.clear_app_cache()
+            app_path = platform_utils.find_app_executable(app_name)
         
         if app_path:
             try:
-                subprocess.Popen([app_path])
+                # Spawn off the response path; launch errors are logged by _spawn_app
+                _SPAWN_POOL.submit(_spawn_app, app_path)
                 return {
                     "success": True,
                     "message": f"Launched {app_name}",
@@ -172,12 +229,11 @@ class CommandExecutor:
                 }
         else:
             # Try to launch by name (Windows will search PATH)
-            import shutil
             path_resolution = shutil.which(app_name)
             
             if path_resolution:
                 try:
-                    subprocess.Popen([path_resolution])
+                    _SPAWN_POOL.submit(_spawn_app, path_resolution)
                     return {
                         "success": True,
                         "message": f"Launched {app_name}",
@@ -198,10 +254,6 @@ class CommandExecutor:
     
     def _execute_create_file(self, command: Command) -> Dict[str, Any]:
         """Execute file creation"""
-        import os
-        import subprocess
-        from pathlib import Path
-        
         parameters = command.parameters
         full_path = Path(parameters.get("full_path", ""))
         content = parameters.get("content")
@@ -240,9 +292,6 @@ class CommandExecutor:
     
     def _execute_create_folder(self, command: Command) -> Dict[str, Any]:
         """Execute folder creation"""
-        import subprocess
-        from pathlib import Path
-        
         full_path = Path(command.parameters.get("full_path", ""))
         
         try:
@@ -269,8 +318,6 @@ class CommandExecutor:
     
     def _execute_delete_file(self, command: Command) -> Dict[str, Any]:
         """Execute file deletion"""
-        from pathlib import Path
-        
         full_path = Path(command.parameters.get("full_path", ""))
         
         try:
@@ -297,9 +344,6 @@ class CommandExecutor:
     
     def _execute_delete_folder(self, command: Command) -> Dict[str, Any]:
         """Execute folder deletion"""
-        from pathlib import Path
-        import shutil
-        
         full_path = Path(command.parameters.get("full_path", ""))
         
         try:
@@ -326,10 +370,6 @@ class CommandExecutor:
     
     def _execute_research(self, command: Command) -> Dict[str, Any]:
         """Execute research command and save to Desktop/research data by fluffy"""
-        import subprocess
-        from pathlib import Path
-        import re
-        
         topic = command.parameters.get("topic", "")
         
         try:
@@ -339,19 +379,21 @@ class CommandExecutor:
             research_dir.mkdir(parents=True, exist_ok=True)
             
             # 2. Sanitize topic for filename
-            safe_topic = re.sub(r'[^\w\s-]', '', topic).strip().replace(' ', '_')
+            safe_topic = _SAFE_NAME_RE.sub('', topic).strip().replace(' ', '_')
             if not safe_topic: safe_topic = "unnamed_research"
             
             filename = f"{safe_topic}_research.md"
             full_path = research_dir / filename
             
             # 3. Create content
-            content = f"# Research: {topic}\n\n"
-            content += f"Research topic: {topic}\n"
-            content += f"Saved at: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            content += "## Notes\n\n"
-            content += "(Research functionality integrated - findings saved successfully)\n"
-            content += "\n--- \nGenerated by Fluffy Assistant"
+            content = (
+                f"# Research: {topic}\n\n"
+                f"Research topic: {topic}\n"
+                f"Saved at: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+                "## Notes\n\n"
+                "(Research functionality integrated - findings saved successfully)\n"
+                "\n--- \nGenerated by Fluffy Assistant"
+            )
             
             full_path.write_text(content, encoding='utf-8')
             
@@ -402,8 +444,6 @@ class CommandExecutor:
     
     def _execute_system_command(self, command: Command) -> Dict[str, Any]:
         """Execute system command (shutdown, restart, etc.)"""
-        import subprocess
-        
         sys_command = command.parameters.get("command", "")
         
         # Use platform-aware system commands
@@ -423,7 +463,9 @@ class CommandExecutor:
             }
         
         try:
-            subprocess.Popen(cmd_args)
+            # Lock/sleep on Windows go straight to the Win32 API (no rundll32 spawn)
+            if not platform_utils.run_native_system_command(sys_command):
+                subprocess.Popen(cmd_args)
             return {
                 "success": True,
                 "message": f"System {sys_command} initiated",
@@ -464,9 +506,6 @@ class CommandExecutor:
     
     def _execute_web_search(self, command: Command) -> Dict[str, Any]:
         """Execute web search command"""
-        import webbrowser
-        import urllib.parse
-        
         query = command.parameters.get("query", "")
         
         try:
@@ -491,11 +530,6 @@ class CommandExecutor:
     
     def _execute_create_project(self, command: Command) -> Dict[str, Any]:
         """Execute AI-powered project creation"""
-        import subprocess
-        import re
-        from pathlib import Path
-        from brain.project_generator import get_generator
-        
         project_type = command.parameters.get("project_type", "website")
         description = command.parameters.get("description", "")
         location = command.parameters.get("location", "Desktop")
@@ -511,8 +545,7 @@ class CommandExecutor:
                 base_path = Path(location)
             
             # Generate project name from description
-            project_name = re.sub(r'[^\w\s-]', '', description).strip()
-            project_name = re.sub(r'[-\s]+', '_', project_name)[:50]
+            project_name = _WS_RUN_RE.sub('_', _SAFE_NAME_RE.sub('', description).strip())[:50]
             
             if not project_name:
                 project_name = f"{project_type}_project"
@@ -526,16 +559,22 @@ class CommandExecutor:
             print(f"[Executor] Description: {description}")
             
             # Generate project using LLM
-            generator = get_generator()
+            generator = self._get_generator()
             project = generator.generate_project(project_type, description, animated)
             
-            # Create files
-            created_files = []
-            for filename, content in project["files"].items():
-                file_path = project_path / filename
-                file_path.write_text(content, encoding='utf-8')
-                created_files.append(filename)
+            # Create files (writes overlap)
+            def write_file(item):
+                filename, content = item
+                (project_path / filename).write_bytes(content.encode('utf-8'))
                 print(f"[Executor] Created: {filename} ({len(content)} chars)")
+                return filename
+            
+            files = project["files"]
+            if len(files) > 1:
+                with ThreadPoolExecutor(max_workers=min(8, len(files))) as pool:
+                    created_files = list(pool.map(write_file, files.items()))
+            else:
+                created_files = [write_file(item) for item in files.items()]
             
             # Auto-open project folder
             try:
@@ -552,7 +591,6 @@ class CommandExecutor:
             }
         
         except Exception as e:
-            import traceback
             traceback.print_exc()
             return {
                 "success": False,
@@ -562,54 +600,42 @@ class CommandExecutor:
     
     def _execute_help(self, command: Command) -> Dict[str, Any]:
         """Show available commands help"""
-        help_text = (
-            "Here's what I can help you with:\n\n"
-            "🚀 **App Management**\n"
-            "- 'open [app name]'\n"
-            "- 'close [app name]'\n"
-            "- 'kill process [name]'\n\n"
-            "📁 **File Operations**\n"
-            "- 'create file [name] in [desktop/documents/downloads]'\n"
-            "- 'create folder [name] in [location]'\n"
-            "- 'delete file [name] from [location]'\n\n"
-            "🌐 **Web & Research**\n"
-            "- 'search for [query]'\n"
-            "- 'research [topic] and save'\n\n"
-            "⚙️ **System**\n"
-            "- 'lock', 'shutdown', 'restart'\n\n"
-            "Just type or say a command to get started!"
+        # Callers may annotate the result, so hand out a copy
+        return dict(_HELP_RESPONSE)
+    
+    def _execute_type_text(self, command: Command) -> Dict[str, Any]:
+        """Unpack TYPE_TEXT parameters for _type_text"""
+        return self._type_text(
+            command.parameters.get("text", ""),
+            command.parameters.get("target_app")
         )
-        return {
-            "success": True,
-            "message": help_text,
-            "action": "info"
-        }
     
     def _type_text(self, text: str, target_app: Optional[str] = None) -> Dict[str, Any]:
         """Type text using keyboard automation"""
+        # Long strings on Windows go through one batched SendInput call
+        use_send_input = platform_utils.IS_WINDOWS and len(text) > 16
+
+        if pyautogui is None and not use_send_input:
+            return {
+                "success": False,
+                "message": "pyautogui not installed. Run: pip install pyautogui",
+                "action": "error"
+            }
+
         try:
-            import pyautogui
-            import time
-            
             # Longer delay to ensure app is ready and focused
             time.sleep(1.0)
-            
-            # Type the text character by character (more reliable than write())
-            for char in text:
-                pyautogui.press(char) if char.isalnum() or char == ' ' else pyautogui.typewrite(char)
-                time.sleep(0.05)  # Small delay between characters
-            
+
+            if not (use_send_input and platform_utils.send_unicode_text(text)):
+                if pyautogui is None:
+                    raise RuntimeError("SendInput failed and pyautogui is not installed")
+                pyautogui.write(text, interval=0.01)
+
             return {
                 "success": True,
                 "message": f"Typed: {text[:50]}..." if len(text) > 50 else f"Typed: {text}",
                 "action": "text_typed"
             }
-        except ImportError:
-            return {
-                "success": False,
-                "message": "pyautogui not installed. Run: pip install pyautogui",
-                "action": "error"
-            }
         except Exception as e:
             return {
                 "success": False,
@@ -619,13 +645,17 @@ class CommandExecutor:
     
     def execute_multi_step(self, commands: list, validator) -> Dict[str, Any]:
         """Execute multiple commands in sequence"""
-        import time
-        
         results = []
+        # Validation depends only on intent + parameters, so repeated steps
+        # ("open chrome; open chrome") are validated once
+        validated: Dict[Tuple, ValidationResult] = {}
         
         for i, cmd in enumerate(commands):
             # Validate
-            validation = validator.validate(cmd)
+            key = (cmd.intent, tuple(sorted((k, str(v)) for k, v in cmd.parameters.items())))
+            validation = validated.get(key)
+            if validation is None:
+                validation = validated[key] = validator.validate(cmd)
             
             # Execute
             result = self.execute(cmd, validation)
@@ -654,6 +684,23 @@ class CommandExecutor:
             "steps_completed": len(commands),
             "results": results
         }
+    
+    # Built-in intent -> handler jump table (unbound methods, called as handler(self, command))
+    _INTENT_DISPATCH = {
+        Intent.OPEN_APP: _execute_open_app,
+        Intent.CLOSE_APP: _execute_close_app,
+        Intent.CREATE_FILE: _execute_create_file,
+        Intent.CREATE_FOLDER: _execute_create_folder,
+        Intent.DELETE_FILE: _execute_delete_file,
+        Intent.DELETE_FOLDER: _execute_delete_folder,
+        Intent.SYSTEM_COMMAND: _execute_system_command,
+        Intent.KILL_PROCESS: _execute_kill_process,
+        Intent.TYPE_TEXT: _execute_type_text,
+        Intent.CREATE_PROJECT: _execute_create_project,
+        Intent.RESEARCH: _execute_research,
+        Intent.HELP: _execute_help,
+        Intent.CHAT: _execute_chat,
+    }
 
 
 # Test function
@@ -9,6 +9,14 @@ from enum import Enum
 from pathlib import Path
 import os
 
+# Leading preposition/article in spoken locations ("in the desktop")
+_LOCATION_PREFIX_RE = re.compile(r"^(?:in|at|on|to|from|the)\s+")
+
+
+def _strip_or(value: Optional[str], default):
+    """Stripped regex group, or default when the group didn't participate"""
+    return value.strip() if value else default
+
 
 class Intent(Enum):
     """Command intents"""
@@ -35,6 +43,10 @@ class Intent(Enum):
 
 class Command:
     """Parsed command with intent and parameters"""
+    # llm_response is attached later by the LLM service for CHAT commands,
+    # so instances stay mutable (and unhashable) rather than a frozen dataclass
+    __slots__ = ("intent", "parameters", "raw_text", "llm_response")
+    
     def __init__(self, intent: Intent, parameters: Dict[str, Any], raw_text: str):
         self.intent = intent
         self.parameters = parameters
@@ -61,6 +73,11 @@ class CommandParser:
     
     def __init__(self):
         self.home = Path.home()
+        # Alias -> resolved folder, joined once instead of on every command
+        self._alias_dirs = {
+            alias: self.home / canonical
+            for alias, canonical in self.FOLDER_ALIASES.items()
+        }
         # Integration with ExtensionLoader
         try:
             from brain.extension_loader import get_extension_loader
@@ -80,11 +97,11 @@ class CommandParser:
     def _resolve_path(self, location: str, filename: str) -> Path:
         """Resolve location string to full path (still useful for file operations)"""
         location_lower = location.lower()
-        location_lower = re.sub(r"^(?:in|at|on|to|from|the)\s+", "", location_lower)
+        location_lower = _LOCATION_PREFIX_RE.sub("", location_lower)
         
-        if location_lower in self.FOLDER_ALIASES:
-            folder_name = self.FOLDER_ALIASES[location_lower]
-            return self.home / folder_name / filename
+        base = self._alias_dirs.get(location_lower)
+        if base is not None:
+            return base / filename
         
         if os.path.isabs(location):
             return Path(location) / filename
@@ -95,19 +112,17 @@ class CommandParser:
         """Extract parameters for CREATE_PROJECT intent"""
         animated = "animated" in text.lower()
         groups = match.groups()
+        n = len(groups)
         
-        # Try to extract from groups
-        if len(groups) >= 4 and groups[3]:  # Has location
-            project_type = groups[1].strip() if groups[1] else "website"
-            description = groups[2].strip()
-            location = groups[3].strip()
-        elif len(groups) >= 3:
-            project_type = groups[1].strip() if groups[1] else "website"
-            description = groups[2].strip()
-            location = "Desktop"
+        # Each group is stripped once; missing groups fall back to the defaults
+        if n >= 3:
+            project_type = _strip_or(groups[1], "website")
+            description = _strip_or(groups[2], "")
+            location = _strip_or(groups[3], None) if n >= 4 else None
+            location = location or "Desktop"
         else:
             project_type = "website"
-            description = groups[0].strip() if groups else text
+            description = _strip_or(groups[0], "") if groups else text
             location = "Desktop"
         
         return {
@@ -1,12 +1,76 @@
 import socket
 import json
+import os
+import select
+import sys
+import tempfile
+import threading
+
+try:
+    import orjson  # Optional: encodes straight to bytes
+except ImportError:
+    orjson = None
 
 COMMAND_HOST = "127.0.0.1"
 COMMAND_PORT = 9002
+# Unix domain socket the core also listens on (POSIX only); preferred over TCP
+COMMAND_SOCK_PATH = os.path.join(tempfile.gettempdir(), "fluffy_core.sock")
+CONNECT_TIMEOUT = 2.0
+SEND_TIMEOUT = 2.0
+_DELIMITER = b"\n"
+
+# One persistent connection to the core, shared by all callers
+_sock = None
+_lock = threading.Lock()
+
+
+def _connect():
+    if sys.platform != "win32" and os.path.exists(COMMAND_SOCK_PATH):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.settimeout(CONNECT_TIMEOUT)
+        try:
+            s.connect(COMMAND_SOCK_PATH)
+            s.settimeout(SEND_TIMEOUT)
+            return s
+        except OSError:
+            # Stale socket file from an old core - use TCP instead
+            s.close()
+
+    s = socket.create_connection((COMMAND_HOST, COMMAND_PORT), timeout=CONNECT_TIMEOUT)
+    s.settimeout(SEND_TIMEOUT)
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return s
+
+
+def _peer_closed(s) -> bool:
+    # The core never writes on this socket, so readability means it hung up
+    readable, _, _ = select.select([s], [], [], 0)
+    return bool(readable)
 
 
 def send_command(command: dict):
-    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    s.connect((COMMAND_HOST, COMMAND_PORT))
-    s.sendall((json.dumps(command) + "\n").encode())
-    s.close()
+    global _sock
+    if orjson is not None:
+        payload = orjson.dumps(command) + _DELIMITER
+    else:
+        payload = json.dumps(command).encode() + _DELIMITER
+
+    with _lock:
+        try:
+            if _sock is not None and _peer_closed(_sock):
+                _sock.close()
+                _sock = None
+            if _sock is None:
+                _sock = _connect()
+            try:
+                _sock.sendall(payload)
+            except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                # Core restarted since the last command - reconnect once
+                _sock.close()
+                _sock = _connect()
+                _sock.sendall(payload)
+        except OSError:
+            if _sock is not None:
+                _sock.close()
+                _sock = None
+            raise
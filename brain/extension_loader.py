@@ -4,11 +4,75 @@ Dynamically loads and manages Fluffy extensions
 """
 
 import json
-import importlib
+import importlib.util
+import logging
+import mmap
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+try:
+    import orjson  # Optional: faster parsing of metadata.json / registry.json
+except ImportError:
+    orjson = None
+
+# Handlers are configured by the host process; nothing is formatted unless enabled
+logger = logging.getLogger(__name__)
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes with orjson when available"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _load_json_file(path: Path):
+    """
+    Parse a JSON file. With orjson the file is mapped and parsed in place
+    rather than copied into a bytes object first.
+    """
+    if orjson is None:
+        return json.loads(path.read_bytes())
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(b"")  # mmap can't map an empty file; raise the usual decode error
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()
+
+
+def _intent_key(command) -> str:
+    """String registry key for a command's intent (Intent member, duck-typed stand-in, or str)"""
+    value = getattr(command.intent, 'value', None)
+    return value if value is not None else str(command.intent)
+
+
+def _load_extension_module(ext_dir: Path, part: str, fresh: bool = False):
+    """
+    Load extensions/<ext>/<part>.py straight from its file, registered as
+    extensions.<ext>.<part>. Reuses the cached module unless fresh is set.
+    """
+    name = f"extensions.{ext_dir.name}.{part}"
+    if not fresh and name in sys.modules:
+        return sys.modules[name]
+    
+    spec = importlib.util.spec_from_file_location(name, ext_dir / f"{part}.py")
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {name} from {ext_dir}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(name, None)
+        raise
+    return module
+
 
 class ExtensionLoader:
     """Load and manage extensions"""
@@ -17,9 +81,16 @@ class ExtensionLoader:
         self.extensions_dir = Path(__file__).parent / "extensions"
         self.registry_path = self.extensions_dir / "registry.json"
         self.extensions = {}
+        # Entries whose handler is imported, filled on first dispatch. Keyed by the
+        # intent string: ad-hoc intent objects (self_improver) hash by identity
+        self._by_intent = {}
         self.load_errors = {}  # Track loading errors for better user feedback
         self._registry_cache = None
         self._registry_mtime = None
+        self._dir_mtime = None  # extensions_dir mtime at the last full scan
+        self._import_lock = threading.Lock()  # guards first-use handler imports
+        self._meta_cache = {}  # metadata.json path -> (mtime_ns, parsed)
+        self._path_added = False
         self._ensure_extensions_dir()
         self.load_all_extensions()
     
@@ -27,85 +98,185 @@ class ExtensionLoader:
         """Create extensions directory if it doesn't exist"""
         if not self.extensions_dir.exists():
             self.extensions_dir.mkdir(parents=True, exist_ok=True)
-            print(f"[ExtensionLoader] Created extensions directory: {self.extensions_dir}")
+            logger.info("Created extensions directory: %s", self.extensions_dir)
     
     def get_last_load_error(self, intent: str) -> str:
         """Get detailed error message for failed extension load"""
         return self.load_errors.get(intent, "Unknown error - check console logs")
     
-    def load_all_extensions(self):
-        """Load all extensions from extensions folder"""
-        # Add extensions to Python path
+    def load_all_extensions(self, force: bool = False):
+        """
+        Load extensions from the extensions folder. Directories that are already
+        loaded are skipped unless force is set, so a rescan only pays for new ones.
+        """
+        # Adding/removing an extension folder bumps the directory mtime;
+        # when it hasn't moved there is nothing new to scan
+        try:
+            dir_mtime = self.extensions_dir.stat().st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        if not force and dir_mtime is not None and dir_mtime == self._dir_mtime:
+            return
+        self._dir_mtime = dir_mtime
+        
+        self._ensure_parent_on_path()
+        
+        loaded_names = set() if force else {entry["name"] for entry in self.extensions.values()}
+        
+        # scandir entries carry the d_type from the directory read, so is_dir() needs no stat
+        with os.scandir(self.extensions_dir) as entries:
+            ext_dirs = [Path(e.path) for e in entries
+                        if e.is_dir() and not e.name.startswith('__') and e.name not in loaded_names]
+        
+        if not ext_dirs:
+            if not self.extensions:
+                logger.info("No extensions found in %s", self.extensions_dir)
+            return
+        
+        # Entries are about to be replaced, drop the dispatch aliases
+        self._by_intent.clear()
+        
+        # Metadata reads overlap across worker threads;
+        # results are applied here, in directory order, on the calling thread
+        if len(ext_dirs) > 1:
+            workers = min(8, os.cpu_count() or 1, len(ext_dirs))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._try_load_one, ext_dirs))
+        else:
+            results = [self._try_load_one(ext_dir) for ext_dir in ext_dirs]
+        
+        loaded_count = 0
+        for ext_dir, (loaded, error) in zip(ext_dirs, results):
+            if self._apply_loaded(ext_dir, loaded, error):
+                loaded_count += 1
+        
+        if loaded_count > 0:
+            logger.info("Total extensions loaded: %d", loaded_count)
+        elif not self.extensions:
+            logger.info("No extensions found in %s", self.extensions_dir)
+    
+    def _apply_loaded(self, ext_dir: Path, loaded, error) -> bool:
+        """Register one _try_load_one result; returns True if an extension was added"""
+        if error is not None:
+            # Store detailed error for user feedback
+            error_msg = f"{type(error).__name__}: {str(error)}"
+            self.load_errors[ext_dir.name] = error_msg
+            logger.error("✗ Failed to load %s: %s", ext_dir.name, error_msg)
+            return False
+        
+        if loaded is None:
+            logger.debug("Skipping %s: no metadata.json", ext_dir.name)
+            return False
+        
+        intent, entry = loaded
+        self.extensions[intent] = entry
+        logger.info("✓ Loaded: %s", entry['metadata'].get('name', intent))
+        
+        # Clear any previous errors for this extension
+        if intent in self.load_errors:
+            del self.load_errors[intent]
+        return True
+    
+    def _ensure_parent_on_path(self):
+        """
+        Put brain/ on sys.path once per loader. Extension modules load by file
+        location and don't need it; it stays for the bare-name sibling imports
+        (extension_loader, command_parser) that handlers and the self-improver use.
+        """
+        if self._path_added:
+            return
         extensions_parent = str(self.extensions_dir.parent)
         if extensions_parent not in sys.path:
             sys.path.insert(0, extensions_parent)
+        self._path_added = True
+    
+    def _read_metadata(self, path: Path) -> dict:
+        """Parse a metadata.json, reusing the last result while its mtime is unchanged"""
+        mtime = path.stat().st_mtime_ns
+        hit = self._meta_cache.get(path)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+        data = _loads(path.read_bytes())
+        self._meta_cache[path] = (mtime, data)
+        return data
+    
+    def _load_one(self, ext_dir: Path):
+        """Read one extension's metadata into a not-yet-imported entry (runs on a worker thread)"""
+        try:
+            metadata = self._read_metadata(ext_dir / "metadata.json")
+        except FileNotFoundError:
+            return None
         
-        loaded_count = 0
+        intent = metadata.get("intent", ext_dir.name)
         
-        for ext_dir in self.extensions_dir.iterdir():
-            if not ext_dir.is_dir():
-                continue
-            
-            if ext_dir.name.startswith('__'):
-                continue
-            
-            metadata_file = ext_dir / "metadata.json"
-            if not metadata_file.exists():
-                print(f"[ExtensionLoader] Skipping {ext_dir.name}: no metadata.json")
-                continue
-            
+        # Handler/validator are imported on first use (see _ensure_imported)
+        # so startup doesn't pay for unused ones
+        return intent, {
+            "name": ext_dir.name,
+            "metadata": metadata,
+            "handler": None,
+            "validator": None,
+            "import_error": None,  # last failed import, retried on next use
+            "_dir": ext_dir
+        }
+    
+    def _try_load_one(self, ext_dir: Path):
+        """_load_one, returning (result, error) instead of raising"""
+        try:
+            return self._load_one(ext_dir), None
+        except Exception as e:
+            return None, e
+    
+    def has_extension(self, intent: str) -> bool:
+        """Check if a usable extension exists for intent (imports it on first check)"""
+        return self._ensure_imported(intent) is not None
+    
+    def _ensure_imported(self, intent: str) -> Optional[dict]:
+        """
+        Import a lazily registered extension's handler and validator on first use.
+        An extension that fails to import stays registered with its error recorded,
+        and the import is retried (from disk) on the next use or reload.
+        """
+        entry = self.extensions.get(intent)
+        if entry is None or entry["handler"] is not None:
+            return entry
+        
+        with self._import_lock:
+            if entry["handler"] is not None:
+                return entry
+            # After a failure, don't reuse a half of the pair cached by the last attempt
+            fresh = entry.get("import_error") is not None
             try:
-                # Load metadata
-                metadata = json.loads(metadata_file.read_text())
-                intent = metadata.get("intent", ext_dir.name)
-                
-                # Load handler
-                handler_module = importlib.import_module(
-                    f"extensions.{ext_dir.name}.handler"
-                )
-                handler = handler_module.get_handler()
-                
-                # Load validator
-                validator_module = importlib.import_module(
-                    f"extensions.{ext_dir.name}.validator"
-                )
-                validator = validator_module.get_validator()
-                
-                # Store extension
-                self.extensions[intent] = {
-                    "name": ext_dir.name,
-                    "metadata": metadata,
-                    "handler": handler,
-                    "validator": validator
-                }
-                
-                loaded_count += 1
-                print(f"[ExtensionLoader] ✓ Loaded: {metadata.get('name', intent)}")
-                
-                # Clear any previous errors for this extension
-                if intent in self.load_errors:
-                    del self.load_errors[intent]
-                
+                handler_module = _load_extension_module(entry["_dir"], "handler", fresh=fresh)
+                validator_module = _load_extension_module(entry["_dir"], "validator", fresh=fresh)
+                entry["validator"] = validator_module.get_validator()
+                entry["handler"] = handler_module.get_handler()  # set last: marks the entry ready
+                entry["import_error"] = None
+                self.load_errors.pop(entry["name"], None)
+                return entry
             except Exception as e:
-                # Store detailed error for user feedback
                 error_msg = f"{type(e).__name__}: {str(e)}"
-                self.load_errors[ext_dir.name] = error_msg
-                print(f"[ExtensionLoader] ✗ Failed to load {ext_dir.name}: {error_msg}")
-        
-        if loaded_count > 0:
-            print(f"[ExtensionLoader] Total extensions loaded: {loaded_count}")
-        else:
-            print(f"[ExtensionLoader] No extensions found in {self.extensions_dir}")
+                entry["import_error"] = error_msg
+                self.load_errors[entry["name"]] = error_msg
+                logger.error("✗ Failed to load %s: %s", entry['name'], error_msg)
+                return None
     
-    def has_extension(self, intent: str) -> bool:
-        """Check if extension exists for intent"""
-        return intent in self.extensions
+    def _entry_for(self, command) -> Optional[dict]:
+        """Find the extension entry for a command, skipping the import check after the first hit"""
+        intent = _intent_key(command)
+        entry = self._by_intent.get(intent)
+        if entry is None:
+            entry = self._ensure_imported(intent)
+            if entry is not None:
+                self._by_intent[intent] = entry
+        return entry
     
     def execute(self, command, validation) -> Dict[str, Any]:
         """Execute extension handler"""
-        intent = command.intent.value if hasattr(command.intent, 'value') else str(command.intent)
+        entry = self._entry_for(command)
         
-        if intent not in self.extensions:
+        if entry is None:
+            intent = _intent_key(command)
             return {
                 "success": False,
                 "message": f"Extension '{intent}' not found",
@@ -113,7 +284,7 @@ class ExtensionLoader:
             }
         
         try:
-            handler = self.extensions[intent]["handler"]
+            handler = entry["handler"]
             result = handler.execute(command)
             return result
         except Exception as e:
@@ -125,16 +296,17 @@ class ExtensionLoader:
     
     def validate(self, command):
         """Validate using extension validator"""
-        intent = command.intent.value if hasattr(command.intent, 'value') else str(command.intent)
+        entry = self._entry_for(command)
         
-        if intent not in self.extensions:
+        if entry is None:
             return None
         
         try:
-            validator = self.extensions[intent]["validator"]
+            validator = entry["validator"]
             return validator.validate(command)
-        except Exception as e:
-            print(f"[ExtensionLoader] Validation error for {intent}: {e}")
+        except Exception:
+            intent = _intent_key(command)
+            logger.exception("Validation error for %s", intent)
             return None
     
     def get_patterns(self, intent: str) -> list:
@@ -156,29 +328,31 @@ class ExtensionLoader:
     def reload_extension(self, intent: str) -> bool:
         """Reload a specific extension"""
         if intent not in self.extensions:
-            print(f"[ExtensionLoader] Extension '{intent}' not found")
+            logger.warning("Extension '%s' not found", intent)
             return False
         
         ext_name = self.extensions[intent]["name"]
         
         try:
-            # Reload modules
-            handler_module = f"extensions.{ext_name}.handler"
-            validator_module = f"extensions.{ext_name}.validator"
+            # Drop cached modules so they are re-executed from disk
+            sys.modules.pop(f"extensions.{ext_name}.handler", None)
+            sys.modules.pop(f"extensions.{ext_name}.validator", None)
             
-            if handler_module in sys.modules:
-                importlib.reload(sys.modules[handler_module])
-            if validator_module in sys.modules:
-                importlib.reload(sys.modules[validator_module])
+            # Re-read just this extension; the others are untouched
+            ext_dir = self.extensions_dir / ext_name
+            self._by_intent.clear()
+            self._apply_loaded(ext_dir, *self._try_load_one(ext_dir))
             
-            # Reload extension data
-            self.load_all_extensions()
+            # Import now so a broken edit is reported here, not on next use
+            if not self.has_extension(intent):
+                logger.error("✗ Failed to reload %s: %s", intent, self.get_last_load_error(ext_name))
+                return False
             
-            print(f"[ExtensionLoader] ✓ Reloaded: {intent}")
+            logger.info("✓ Reloaded: %s", intent)
             return True
             
-        except Exception as e:
-            print(f"[ExtensionLoader] ✗ Failed to reload {intent}: {e}")
+        except Exception:
+            logger.exception("✗ Failed to reload %s", intent)
             return False
     
     def load_registry(self) -> dict:
@@ -189,24 +363,26 @@ class ExtensionLoader:
             current_mtime = self.registry_path.stat().st_mtime
             if self._registry_cache and self._registry_mtime == current_mtime:
                 return self._registry_cache
-            with open(self.registry_path, 'r', encoding='utf-8') as f:
-                registry = json.load(f)
+            registry = _load_json_file(self.registry_path)
             self._registry_cache = registry
             self._registry_mtime = current_mtime
             return registry
         except Exception as e:
-            print(f"[ExtensionLoader] Failed to load registry: {e}")
+            logger.error("Failed to load registry: %s", e)
             return {}
     
     def save_registry(self, registry: dict):
         """Save registry to JSON file"""
         try:
-            with open(self.registry_path, 'w', encoding='utf-8') as f:
-                json.dump(registry, f, indent=2)
+            if orjson is not None:
+                self.registry_path.write_bytes(orjson.dumps(registry, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.registry_path, 'w', encoding='utf-8') as f:
+                    json.dump(registry, f, indent=2)
             self._registry_mtime = self.registry_path.stat().st_mtime
             self._registry_cache = registry
         except Exception as e:
-            print(f"[ExtensionLoader] Failed to save registry: {e}")
+            logger.error("Failed to save registry: %s", e)
     
     def refresh_extensions(self) -> list:
         """Hot-reload extensions from registry"""
@@ -219,22 +395,11 @@ class ExtensionLoader:
             if not ext_dir.exists():
                 continue
             try:
-                with open(ext_dir / "metadata.json", 'r', encoding='utf-8') as f:
-                    ext_metadata = json.load(f)
-                module_name = f"extensions.{metadata['directory']}.handler"
-                if module_name in sys.modules:
-                    importlib.reload(sys.modules[module_name])
-                else:
-                    sys.path.insert(0, str(self.extensions_dir.parent))
-                    importlib.import_module(module_name)
-                handler = sys.modules[module_name].get_handler()
-                validator_module_name = f"extensions.{metadata['directory']}.validator"
-                if validator_module_name in sys.modules:
-                    importlib.reload(sys.modules[validator_module_name])
-                else:
-                    importlib.import_module(validator_module_name)
-                validator = sys.modules[validator_module_name].get_validator()
+                ext_metadata = self._read_metadata(ext_dir / "metadata.json")
+                handler = _load_extension_module(ext_dir, "handler", fresh=True).get_handler()
+                validator = _load_extension_module(ext_dir, "validator", fresh=True).get_validator()
                 self.extensions[intent] = {
+                    "name": ext_dir.name,
                     "handler": handler,
                     "validator": validator,
                     "metadata": ext_metadata,
@@ -242,9 +407,9 @@ class ExtensionLoader:
                     "description": ext_metadata.get("description", "")
                 }
                 newly_loaded.append(intent)
-                print(f"[ExtensionLoader] ✓ Hot-loaded: {intent}")
+                logger.info("✓ Hot-loaded: %s", intent)
             except Exception as e:
-                print(f"[ExtensionLoader] ✗ Failed to hot-load {intent}: {e}")
+                logger.exception("✗ Failed to hot-load %s", intent)
                 self.load_errors[intent] = str(e)
         return newly_loaded
     
@@ -260,15 +425,14 @@ class ExtensionLoader:
         """Scan extensions/ and update registry"""
         registry = self.load_registry()
         updated = False
-        for ext_dir in self.extensions_dir.iterdir():
-            if not ext_dir.is_dir() or ext_dir.name.startswith('_') or ext_dir.name == '__pycache__':
-                continue
+        with os.scandir(self.extensions_dir) as entries:
+            ext_dirs = [Path(e.path) for e in entries if e.is_dir() and not e.name.startswith('_')]
+        for ext_dir in ext_dirs:
             meta_file = ext_dir / "metadata.json"
             if not meta_file.exists():
                 continue
             try:
-                with open(meta_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
+                metadata = self._read_metadata(meta_file)
                 intent = metadata.get('intent', ext_dir.name)
                 if intent not in registry:
                     registry[intent] = {
@@ -283,9 +447,9 @@ class ExtensionLoader:
                         "author": metadata.get('author', 'Unknown')
                     }
                     updated = True
-                    print(f"[ExtensionLoader] Added {intent} to registry")
+                    logger.info("Added %s to registry", intent)
             except Exception as e:
-                print(f"[ExtensionLoader] Failed to sync {ext_dir.name}: {e}")
+                logger.error("Failed to sync %s: %s", ext_dir.name, e)
         if updated:
             self.save_registry(registry)
         return updated
@@ -318,6 +482,7 @@ def get_extension_loader() -> ExtensionLoader:
 
 # Test function
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[ExtensionLoader] %(message)s")
     print("=" * 70)
     print("Extension Loader - Test")
     print("=" * 70)
@@ -4,15 +4,342 @@ Controls Bluetooth on Windows and Linux
 """
 
 from typing import Dict, Any
+import asyncio
+import base64
+import os
+import queue
 import subprocess
 import platform
+import threading
+import time
 
-IS_WINDOWS = platform.system() == "Windows"
-IS_LINUX = platform.system() == "Linux"
+_SYSTEM = platform.system()
+IS_WINDOWS = _SYSTEM == "Windows"
+IS_LINUX = _SYSTEM == "Linux"
+
+PowerShell = None
+if IS_WINDOWS:
+    try:
+        import clr  # Optional: pythonnet, hosts PowerShell in-process
+        clr.AddReference("System.Management.Automation")
+        from System.Management.Automation import PowerShell
+        from System.Management.Automation.Runspaces import RunspaceFactory
+    except Exception:
+        PowerShell = None
+
+try:
+    # Optional: jeepney, talks to BlueZ over the system D-Bus instead of spawning rfkill/bluetoothctl
+    from jeepney import DBusAddress, Properties, new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+except ImportError:
+    open_dbus_connection = None
+
+_BLUEZ_ROOT = None if open_dbus_connection is None else DBusAddress(
+    "/", bus_name="org.bluez", interface="org.freedesktop.DBus.ObjectManager"
+)
+_BLUEZ_ADAPTER = "org.bluez.Adapter1"
+_system_bus = None
+_system_bus_lock = threading.Lock()
+
+# `rfkill -rno SOFT,HARD list bluetooth` row for a radio that is neither soft- nor hard-blocked
+_RFKILL_UNBLOCKED_ROW = b"unblocked unblocked"
+
+# Seconds to wait for one command before failing fast. rfkill/bluetoothctl/D-Bus
+# answer in well under a second
+_LINUX_TIMEOUT = 3
+_WINDOWS_TIMEOUT = 5
+# Seconds a cold PowerShell host gets to start and load the WinRT prelude
+_PS_STARTUP_TIMEOUT = 30
+
+_ENABLE_ACTIONS = frozenset({"on", "enable", "enabled"})
+_DISABLE_ACTIONS = frozenset({"off", "disable", "disabled"})
+
+# Seconds a known radio state is trusted before it is checked again
+_STATE_TTL = 1.0
+
+# Printed by the PowerShell host after each command's output
+_PS_SENTINEL = "<<<FLUFFY_END>>>"
+# Printed once by the PowerShell host when the prelude has loaded
+_PS_READY = "<<<FLUFFY_READY>>>"
+
+# WinRT radio types and the Bluetooth functions, loaded once per PowerShell session
+_PS_PRELUDE = r"""
+Add-Type -AssemblyName System.Runtime.WindowsRuntime
+$asTaskGeneric = ([System.WindowsRuntimeSystemExtensions].GetMethods() | Where-Object { $_.Name -eq 'AsTask' -and $_.GetParameters().Count -eq 1 -and $_.GetParameters()[0].ParameterType.Name -eq 'IAsyncOperation`1' })[0]
+
+Function Await($WinRtTask, $ResultType) {
+    $asTask = $asTaskGeneric.MakeGenericMethod($ResultType)
+    $netTask = $asTask.Invoke($null, @($WinRtTask))
+    $netTask.Wait(-1) | Out-Null
+    $netTask.Result
+}
+
+[Windows.Devices.Radios.Radio,Windows.System.Devices,ContentType=WindowsRuntime] | Out-Null
+[Windows.Devices.Radios.RadioAccessStatus,Windows.System.Devices,ContentType=WindowsRuntime] | Out-Null
+[Windows.Devices.Radios.RadioState,Windows.System.Devices,ContentType=WindowsRuntime] | Out-Null
+
+Function Get-BluetoothRadio {
+    $radios = Await ([Windows.Devices.Radios.Radio]::GetRadiosAsync()) ([System.Collections.Generic.IReadOnlyList[Windows.Devices.Radios.Radio]])
+    $radios | Where-Object { $_.Kind -eq 'Bluetooth' } | Select-Object -First 1
+}
+
+Function Set-BluetoothState($State) {
+    $bluetooth = Get-BluetoothRadio
+    if ($bluetooth -eq $null) {
+        Write-Output "ERROR:NO_ADAPTER"
+    } else {
+        $result = Await ($bluetooth.SetStateAsync($State)) ([Windows.Devices.Radios.RadioAccessStatus])
+        if ($result -eq 'Allowed') {
+            Write-Output "SUCCESS"
+        } else {
+            Write-Output "ERROR:$result"
+        }
+    }
+}
+
+Function Get-BluetoothState {
+    $bluetooth = Get-BluetoothRadio
+    if ($bluetooth -eq $null) {
+        Write-Output "OFF"
+    } else {
+        Write-Output $bluetooth.State
+    }
+}
+"""
+
+# Per-call scripts: fixed text, the functions above do the work
+_PS_ENABLE = "Set-BluetoothState 'On'"
+_PS_DISABLE = "Set-BluetoothState 'Off'"
+_PS_STATUS = "Get-BluetoothState"
+
+# powershell.exe host: after the prelude (and the ready line), runs base64 (UTF-8)
+# scripts read from stdin, one per line, each followed by the sentinel
+_PS_HOST_SCRIPT = _PS_PRELUDE + r"""
+[Console]::Out.WriteLine('<<<FLUFFY_READY>>>')
+[Console]::Out.Flush()
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    try {
+        $script = [Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($line))
+        Invoke-Expression $script 2>&1 | Out-String -Stream | ForEach-Object { [Console]::Out.WriteLine($_) }
+    } catch {
+        [Console]::Out.WriteLine("ERROR:$($_.Exception.Message)")
+    }
+    [Console]::Out.WriteLine('<<<FLUFFY_END>>>')
+    [Console]::Out.Flush()
+}
+"""
+
+
+def _bluez_adapters(timeout: float) -> Dict[str, Any]:
+    """BlueZ adapter object paths -> their Adapter1 properties (caller holds the bus lock)"""
+    global _system_bus
+    if _system_bus is None:
+        _system_bus = open_dbus_connection(bus="SYSTEM")
+    reply = _system_bus.send_and_get_reply(new_method_call(_BLUEZ_ROOT, "GetManagedObjects"), timeout=timeout)
+    objects = unwrap_msg(reply)[0]
+    return {path: ifaces[_BLUEZ_ADAPTER] for path, ifaces in objects.items() if _BLUEZ_ADAPTER in ifaces}
+
+
+def _drop_system_bus():
+    global _system_bus
+    if _system_bus is not None:
+        try:
+            _system_bus.close()
+        except Exception:
+            pass
+        _system_bus = None
+
+
+def _dbus_set_powered(enable: bool, timeout: float = _LINUX_TIMEOUT) -> bool:
+    """
+    Set Adapter1.Powered on every BlueZ adapter. False when D-Bus/BlueZ is
+    unavailable or refuses (e.g. the radio is rfkill-blocked), so the caller
+    can fall back to rfkill/bluetoothctl.
+    """
+    if open_dbus_connection is None:
+        return False
+    with _system_bus_lock:
+        try:
+            adapters = _bluez_adapters(timeout)
+            if not adapters:
+                return False
+            for path in adapters:
+                address = DBusAddress(path, bus_name="org.bluez", interface=_BLUEZ_ADAPTER)
+                unwrap_msg(_system_bus.send_and_get_reply(Properties(address).set("Powered", "b", enable), timeout=timeout))
+            return True
+        except Exception:
+            _drop_system_bus()
+            return False
+
+
+def _dbus_powered(timeout: float = _LINUX_TIMEOUT):
+    """True/False if any BlueZ adapter is powered, None when D-Bus can't tell"""
+    if open_dbus_connection is None:
+        return None
+    with _system_bus_lock:
+        try:
+            adapters = _bluez_adapters(timeout)
+        except Exception:
+            _drop_system_bus()
+            return None
+    if not adapters:
+        return None
+    # Property values arrive as (signature, value) variants
+    return any(props.get("Powered", ("b", False))[1] for props in adapters.values())
+
+
+def _open_bluetooth_settings():
+    """Open the Windows Bluetooth settings page through ShellExecute (no cmd.exe)"""
+    try:
+        os.startfile("ms-settings:bluetooth")
+    except OSError:
+        pass
+
+
+class _RunspaceHost:
+    """
+    PowerShell runspace inside this process (pythonnet), used instead of
+    powershell.exe when available. Same run() contract as _PowerShellHost.
+    """
+    
+    def __init__(self):
+        self._runspace = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _invoke(runspace, script: str, timeout: float) -> str:
+        ps = PowerShell.Create()
+        try:
+            ps.Runspace = runspace
+            ps.AddScript(script)
+            pending = ps.BeginInvoke()
+            if not pending.AsyncWaitHandle.WaitOne(int(timeout * 1000)):
+                ps.Stop()
+                raise subprocess.TimeoutExpired("powershell", timeout)
+            lines = [str(item) for item in ps.EndInvoke(pending)]
+            lines.extend(str(err) for err in ps.Streams.Error)
+            return "\n".join(lines)
+        finally:
+            ps.Dispose()
+    
+    def run(self, script: str, timeout: float) -> str:
+        """Run a script in the runspace and return its output (errors included)"""
+        with self._lock:
+            prelude_output = ""
+            if self._runspace is None:
+                runspace = RunspaceFactory.CreateRunspace()
+                runspace.Open()
+                try:
+                    # Type-load errors surface with the first command, as with the process host
+                    prelude_output = self._invoke(runspace, _PS_PRELUDE, _PS_STARTUP_TIMEOUT)
+                except Exception:
+                    # Without the prelude's functions every later script would fail;
+                    # drop the runspace so the next call starts over
+                    runspace.Dispose()
+                    raise
+                self._runspace = runspace
+            output = self._invoke(self._runspace, script, timeout)
+            return f"{prelude_output}\n{output}" if prelude_output else output
+
+
+# -EncodedCommand takes base64 of UTF-16LE; encoded once rather than per launch
+_PS_HOST_ENCODED = base64.b64encode(_PS_HOST_SCRIPT.encode("utf-16le")).decode("ascii")
+
+class _PowerShellHost:
+    """
+    Long-lived powershell.exe that keeps the WinRT assemblies loaded between
+    commands, so each call is a pipe write and a read instead of a new process.
+    """
+    
+    def __init__(self):
+        self._proc = None
+        self._lines = None
+        self._lock = threading.Lock()
+    
+    def _start(self) -> str:
+        """Launch the host and wait for its prelude; returns whatever the prelude printed"""
+        self._proc = subprocess.Popen(
+            ["powershell", "-NoProfile", "-NoLogo", "-NonInteractive", "-ExecutionPolicy", "Bypass",
+             "-EncodedCommand", _PS_HOST_ENCODED],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, errors="replace", bufsize=1
+        )
+        self._lines = queue.Queue()
+        threading.Thread(target=self._pump, args=(self._proc.stdout, self._lines), daemon=True).start()
+        # Start-up gets its own, longer budget so a slow cold start isn't killed and retried forever
+        output = self._read_until(_PS_READY, _PS_STARTUP_TIMEOUT)
+        if self._proc is None:
+            raise OSError(f"PowerShell host exited during start-up: {output}")
+        return output
+    
+    @staticmethod
+    def _pump(stream, lines):
+        """Forward stdout lines to the queue so reads can time out"""
+        for line in stream:
+            lines.put(line.rstrip("\r\n"))
+        lines.put(None)  # EOF: the host exited
+    
+    def _stop(self):
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+            except OSError:
+                pass
+            self._proc = None
+    
+    def _read_until(self, marker: str, timeout: float) -> str:
+        """Collect host output up to a marker line; the host is stopped on timeout or exit"""
+        deadline = time.monotonic() + timeout
+        output = []
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                # Output would arrive out of step with the next command; start over next time
+                self._stop()
+                raise subprocess.TimeoutExpired("powershell", timeout)
+            if line is None:
+                self._stop()
+                break
+            if line == marker:
+                break
+            output.append(line)
+        return "\n".join(output)
+    
+    def run(self, script: str, timeout: float) -> str:
+        """Run a script in the host and return its output (stderr included)"""
+        payload = base64.b64encode(script.encode("utf-8")).decode("ascii") + "\n"
+        with self._lock:
+            prelude_output = ""
+            if self._proc is None or self._proc.poll() is not None:
+                # Type-load errors surface with the first command, as with the runspace host
+                prelude_output = self._start()
+            try:
+                self._proc.stdin.write(payload)
+                self._proc.stdin.flush()
+            except OSError:
+                # Host died since the last call; start a fresh one
+                self._stop()
+                prelude_output = self._start()
+                self._proc.stdin.write(payload)
+                self._proc.stdin.flush()
+            
+            output = self._read_until(_PS_SENTINEL, timeout)
+            return f"{prelude_output}\n{output}" if prelude_output else output
 
 class BluetoothControlHandler:
     """Handle Bluetooth control operations"""
     
+    def __init__(self, windows_timeout: float = _WINDOWS_TIMEOUT):
+        self.windows_timeout = windows_timeout
+        # Nothing is started until the first Windows call
+        self._powershell = _RunspaceHost() if PowerShell is not None else _PowerShellHost()
+        # (enabled, time.monotonic()) from the last status check or successful toggle
+        self._last_state = None
+    
     def execute(self, command) -> Dict[str, Any]:
         """Turn Bluetooth on or off"""
         try:
@@ -20,10 +347,10 @@ class BluetoothControlHandler:
             action = command.parameters.get("action", "on").lower()
             
             # Determine the action
-            if action in ["on", "enable", "enabled"]:
+            if action in _ENABLE_ACTIONS:
                 enable = True
                 action_text = "enable"
-            elif action in ["off", "disable", "disabled"]:
+            elif action in _DISABLE_ACTIONS:
                 enable = False
                 action_text = "disable"
             elif action == "status":
@@ -34,26 +361,133 @@ class BluetoothControlHandler:
                     "message": f"Unknown action: {action}. Use 'on' or 'off'."
                 }
             
-            if IS_WINDOWS:
-                return self._control_bluetooth_windows(enable, action_text)
-            elif IS_LINUX:
-                return self._control_bluetooth_linux(enable, action_text)
-            else:
+            if not (IS_WINDOWS or IS_LINUX):
                 return {
                     "success": False,
-                    "message": f"Bluetooth control is not supported on {platform.system()}"
+                    "message": f"Bluetooth control is not supported on {_SYSTEM}"
                 }
+            
+            if self._already_in_state(enable):
+                return self._already_result(enable)
+            
+            # Only a confirmed toggle below re-fills the cache
+            self._last_state = None
+            if IS_WINDOWS:
+                return self._control_bluetooth_windows(enable, action_text)
+            return self._control_bluetooth_linux(enable, action_text)
                 
-        except subprocess.TimeoutExpired:
+        except Exception as e:
+            return self._error_result(e)
+
+    @staticmethod
+    def _already_result(enable: bool) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "message": f"✅ Bluetooth is already {'on' if enable else 'off'}."
+        }
+
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        """Response for an exception raised while toggling"""
+        if isinstance(error, subprocess.TimeoutExpired):
             return {
                 "success": False,
                 "message": "⏱️ Bluetooth control timed out. Please try again."
             }
+        return {
+            "success": False,
+            "message": f"❌ Error controlling Bluetooth: {str(error)}"
+        }
+
+    def execute_many(self, commands) -> list:
+        """
+        execute() for a sequence of commands, results in order. On Windows each
+        run of consecutive on/off toggles goes to PowerShell as one script.
+        """
+        if not IS_WINDOWS:
+            return [self.execute(command) for command in commands]
+        
+        results = [None] * len(commands)
+        batch = []  # (index, enable, action_text)
+        for i, command in enumerate(commands):
+            action = command.parameters.get("action", "on").lower()
+            if action in _ENABLE_ACTIONS:
+                batch.append((i, True, "enable"))
+            elif action in _DISABLE_ACTIONS:
+                batch.append((i, False, "disable"))
+            else:
+                self._run_toggle_batch(commands, batch, results)
+                batch = []
+                results[i] = self.execute(command)
+        self._run_toggle_batch(commands, batch, results)
+        return results
+    
+    def _run_toggle_batch(self, commands, batch, results):
+        """Apply a list of toggles in one PowerShell call, one result line per toggle"""
+        if not batch:
+            return
+        # Same short-circuit as execute(): a toggle to the state the radio is already
+        # in isn't sent, nor is one repeating the toggle just before it
+        pending = []  # (index, enable, action_text) sent to PowerShell
+        repeats = []  # (index, position in pending of the toggle it repeats)
+        try:
+            for i, enable, action_text in batch:
+                if pending and pending[-1][1] == enable:
+                    repeats.append((i, len(pending) - 1))
+                elif not pending and self._already_in_state(enable):
+                    results[i] = self._already_result(enable)
+                else:
+                    pending.append((i, enable, action_text))
+            if not pending:
+                return
+            self._last_state = None
+            script = "\n".join(_PS_ENABLE if enable else _PS_DISABLE for _, enable, _ in pending)
+            output = self._powershell.run(script, timeout=self.windows_timeout)
         except Exception as e:
-            return {
-                "success": False,
-                "message": f"❌ Error controlling Bluetooth: {str(e)}"
-            }
+            for i, _, _ in batch:
+                if results[i] is None:
+                    results[i] = self._error_result(e)
+            return
+        
+        lines = [line for line in output.splitlines() if line.startswith(("SUCCESS", "ERROR:"))]
+        if len(lines) != len(pending):
+            # Something other than a plain result (e.g. WinRT types missing):
+            # let each command take the normal path with its fallbacks
+            for i in sorted([i for i, _, _ in pending] + [i for i, _ in repeats]):
+                results[i] = self.execute(commands[i])
+            return
+        for (i, enable, action_text), line in zip(pending, lines):
+            results[i] = self._windows_result(line, enable, action_text)
+        for i, pos in repeats:
+            if lines[pos].startswith("SUCCESS"):
+                results[i] = self._already_result(pending[pos][1])
+            else:
+                # The toggle it repeats didn't go through; check the radio afresh
+                results[i] = self.execute(commands[i])
+    
+    async def execute_async(self, command) -> Dict[str, Any]:
+        """execute() for asyncio callers; the blocking work runs on a worker thread"""
+        return await asyncio.to_thread(self.execute, command)
+    
+    def _already_in_state(self, enable: bool) -> bool:
+        """True when the radio is known to be in the requested state already"""
+        cached = self._last_state
+        if cached is not None and time.monotonic() - cached[1] < _STATE_TTL:
+            return cached[0] == enable
+        status = self.get_status()
+        if not status.get("success"):
+            return False
+        return status["enabled"] == enable and self._is_trusted(status)
+
+    @staticmethod
+    def _is_trusted(status: Dict[str, Any]) -> bool:
+        """
+        Whether a successful status reading is certain enough to skip a toggle.
+        D-Bus reports the adapter's Powered property, so both answers hold. rfkill
+        only knows about blocking: unblocked doesn't mean the adapter is powered,
+        so only its "off" can be trusted.
+        """
+        return IS_WINDOWS or status.get("source") == "dbus" or not status["enabled"]
 
     # ----------------------------------------------------------------
     # LINUX
@@ -61,15 +495,22 @@ class BluetoothControlHandler:
 
     def _control_bluetooth_linux(self, enable: bool, action_text: str) -> Dict[str, Any]:
         """
-        Control Bluetooth on Linux using rfkill and bluetoothctl.
-        Works on Kali Linux and most desktop Linux distributions.
+        Control Bluetooth on Linux: BlueZ over D-Bus when available, otherwise
+        rfkill and bluetoothctl. Works on Kali Linux and most desktop Linux distributions.
         """
+        if _dbus_set_powered(enable):
+            self._last_state = (enable, time.monotonic())
+            return {
+                "success": True,
+                "message": f"✅ Bluetooth {action_text}d successfully!"
+            }
+        
         try:
             if enable:
                 # Unblock Bluetooth radio with rfkill
                 result = subprocess.run(
                     ["rfkill", "unblock", "bluetooth"],
-                    capture_output=True, text=True, timeout=10
+                    capture_output=True, text=True, timeout=_LINUX_TIMEOUT
                 )
                 if result.returncode != 0:
                     return {
@@ -79,18 +520,18 @@ class BluetoothControlHandler:
                 # Power on via bluetoothctl
                 subprocess.run(
                     ["bluetoothctl", "power", "on"],
-                    capture_output=True, text=True, timeout=10
+                    capture_output=True, text=True, timeout=_LINUX_TIMEOUT
                 )
             else:
                 # Power off via bluetoothctl
                 subprocess.run(
                     ["bluetoothctl", "power", "off"],
-                    capture_output=True, text=True, timeout=10
+                    capture_output=True, text=True, timeout=_LINUX_TIMEOUT
                 )
                 # Block Bluetooth radio with rfkill
                 result = subprocess.run(
                     ["rfkill", "block", "bluetooth"],
-                    capture_output=True, text=True, timeout=10
+                    capture_output=True, text=True, timeout=_LINUX_TIMEOUT
                 )
                 if result.returncode != 0:
                     return {
@@ -98,6 +539,7 @@ class BluetoothControlHandler:
                         "message": f"⚠️ Failed to block Bluetooth: {result.stderr.strip()}"
                     }
             
+            self._last_state = (enable, time.monotonic())
             return {
                 "success": True,
                 "message": f"✅ Bluetooth {action_text}d successfully!"
@@ -114,50 +556,15 @@ class BluetoothControlHandler:
 
     def _control_bluetooth_windows(self, enable: bool, action_text: str) -> Dict[str, Any]:
         """Control Bluetooth on Windows via PowerShell Radio API."""
-        ps_command = f"""
-Add-Type -AssemblyName System.Runtime.WindowsRuntime
-$asTaskGeneric = ([System.WindowsRuntimeSystemExtensions].GetMethods() | Where-Object {{ $_.Name -eq 'AsTask' -and $_.GetParameters().Count -eq 1 -and $_.GetParameters()[0].ParameterType.Name -eq 'IAsyncOperation`1' }})[0]
-
-Function Await($WinRtTask, $ResultType) {{
-    $asTask = $asTaskGeneric.MakeGenericMethod($ResultType)
-    $netTask = $asTask.Invoke($null, @($WinRtTask))
-    $netTask.Wait(-1) | Out-Null
-    $netTask.Result
-}}
-
-[Windows.Devices.Radios.Radio,Windows.System.Devices,ContentType=WindowsRuntime] | Out-Null
-[Windows.Devices.Radios.RadioAccessStatus,Windows.System.Devices,ContentType=WindowsRuntime] | Out-Null
-[Windows.Devices.Radios.RadioState,Windows.System.Devices,ContentType=WindowsRuntime] | Out-Null
+        output = self._powershell.run(_PS_ENABLE if enable else _PS_DISABLE, timeout=self.windows_timeout).strip()
+        return self._windows_result(output, enable, action_text)
 
-$radios = Await ([Windows.Devices.Radios.Radio]::GetRadiosAsync()) ([System.Collections.Generic.IReadOnlyList[Windows.Devices.Radios.Radio]])
-$bluetooth = $radios | Where-Object {{ $_.Kind -eq 'Bluetooth' }} | Select-Object -First 1
-
-if ($bluetooth -eq $null) {{
-    Write-Output "ERROR:NO_ADAPTER"
-}} else {{
-    $action = "{action_text}"
-    if ($action -eq "enable") {{
-        $result = Await ($bluetooth.SetStateAsync('On')) ([Windows.Devices.Radios.RadioAccessStatus])
-    }} else {{
-        $result = Await ($bluetooth.SetStateAsync('Off')) ([Windows.Devices.Radios.RadioAccessStatus])
-    }}
-    
-    if ($result -eq 'Allowed') {{
-        Write-Output "SUCCESS"
-    }} else {{
-        Write-Output "ERROR:$result"
-    }}
-}}
-"""
-        result = subprocess.run(
-            ["powershell", "-ExecutionPolicy", "Bypass", "-Command", ps_command],
-            capture_output=True, text=True, timeout=15
-        )
-        
-        output = result.stdout.strip()
-        error = result.stderr.strip()
+    def _windows_result(self, output: str, enable: bool, action_text: str) -> Dict[str, Any]:
+        """Turn Set-BluetoothState output into a handler response"""
+        error = output
         
         if "SUCCESS" in output:
+            self._last_state = (enable, time.monotonic())
             return {
                 "success": True,
                 "message": f"✅ Bluetooth {action_text}d successfully!"
@@ -178,13 +585,13 @@ if ($bluetooth -eq $null) {{
                 "message": "⚠️ Bluetooth control denied by system. Try running Fluffy as administrator."
             }
         elif error and ("Cannot find type" in error or "Unable to find type" in error):
-            subprocess.run(["start", "ms-settings:bluetooth"], shell=True)
+            _open_bluetooth_settings()
             return {
                 "success": True,
                 "message": f"🔧 Opened Bluetooth settings. Please {action_text} Bluetooth manually.\n(Your Windows version may not support automatic control)"
             }
         else:
-            subprocess.run(["start", "ms-settings:bluetooth"], shell=True)
+            _open_bluetooth_settings()
             return {
                 "success": True,
                 "message": f"🔧 Opened Bluetooth settings. Please {action_text} Bluetooth manually."
@@ -197,57 +604,47 @@ if ($bluetooth -eq $null) {{
     def get_status(self) -> Dict[str, Any]:
         """Check if Bluetooth is currently enabled"""
         if IS_LINUX:
-            return self._get_status_linux()
+            status = self._get_status_linux()
         elif IS_WINDOWS:
-            return self._get_status_windows()
-        return {"success": False, "enabled": False}
+            status = self._get_status_windows()
+        else:
+            return {"success": False, "enabled": False}
+        if status["success"] and self._is_trusted(status):
+            self._last_state = (status["enabled"], time.monotonic())
+        return status
 
     def _get_status_linux(self) -> Dict[str, Any]:
-        """Check Bluetooth status on Linux using rfkill."""
+        """Check Bluetooth status on Linux: adapter power over D-Bus, else rfkill's raw columns."""
+        powered = _dbus_powered()
+        if powered is not None:
+            return {"success": True, "enabled": powered, "source": "dbus"}
         try:
+            # Raw, headerless columns: one "<soft> <hard>" row per radio, single-space
+            # separated, each "blocked"/"unblocked" regardless of locale
             result = subprocess.run(
-                ["rfkill", "list", "bluetooth"],
-                capture_output=True, text=True, timeout=5
+                ["rfkill", "-rno", "SOFT,HARD", "list", "bluetooth"],
+                capture_output=True, timeout=_LINUX_TIMEOUT
             )
-            output = result.stdout.lower()
-            # If "soft blocked: yes" or "hard blocked: yes", BT is off
-            enabled = "soft blocked: no" in output and "hard blocked: no" in output
-            return {"success": True, "enabled": enabled}
+            if result.returncode != 0:
+                return {"success": False, "enabled": False}
+            # On when any radio is neither soft- nor hard-blocked: one scan of the raw bytes
+            enabled = _RFKILL_UNBLOCKED_ROW in result.stdout
+            return {"success": True, "enabled": enabled, "source": "rfkill"}
         except:
             return {"success": False, "enabled": False}
 
     def _get_status_windows(self) -> Dict[str, Any]:
         """Check Bluetooth status on Windows using PowerShell."""
-        ps_command = """
-Add-Type -AssemblyName System.Runtime.WindowsRuntime
-$asTaskGeneric = ([System.WindowsRuntimeSystemExtensions].GetMethods() | Where-Object { $_.Name -eq 'AsTask' -and $_.GetParameters().Count -eq 1 -and $_.GetParameters()[0].ParameterType.Name -eq 'IAsyncOperation`1' })[0]
-
-Function Await($WinRtTask, $ResultType) {
-    $asTask = $asTaskGeneric.MakeGenericMethod($ResultType)
-    $netTask = $asTask.Invoke($null, @($WinRtTask))
-    $netTask.Wait(-1) | Out-Null
-    $netTask.Result
-}
-
-[Windows.Devices.Radios.Radio,Windows.System.Devices,ContentType=WindowsRuntime] | Out-Null
-$radios = Await ([Windows.Devices.Radios.Radio]::GetRadiosAsync()) ([System.Collections.Generic.IReadOnlyList[Windows.Devices.Radios.Radio]])
-$bluetooth = $radios | Where-Object { $_.Kind -eq 'Bluetooth' } | Select-Object -First 1
-
-if ($bluetooth -eq $null) {
-    Write-Output "OFF"
-} else {
-    Write-Output $bluetooth.State
-}
-"""
         try:
-            result = subprocess.run(
-                ["powershell", "-ExecutionPolicy", "Bypass", "-Command", ps_command],
-                capture_output=True, text=True, timeout=5
-            )
-            output = result.stdout.strip()
+            output = self._powershell.run(_PS_STATUS, timeout=self.windows_timeout).strip()
+            # Only a RadioState of exactly On/Off is a reading; "OFF" (no adapter) or
+            # type-load errors are not, so the toggle path and its fallbacks still run
+            state = output.splitlines()[-1].strip() if output else ""
+            if state not in ("On", "Off"):
+                return {"success": False, "enabled": False}
             return {
                 "success": True,
-                "enabled": "On" in output
+                "enabled": state == "On"
             }
         except:
             return {"success": False, "enabled": False}
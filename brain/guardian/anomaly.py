@@ -1,3 +1,52 @@
+from enum import IntEnum
+from functools import lru_cache
+from typing import NamedTuple
+
+try:
+    import numpy as np  # Optional: vectorized threshold checks across a whole tick
+except ImportError:
+    np = None
+
+# Below this many processes a plain loop beats the NumPy setup cost
+_MIN_BATCH = 32
+
+# Sample count from which _confidence_for() is pinned at its 0.98 ceiling;
+# clamping to it keeps the cache at a few dozen keys as baselines keep growing
+_CONFIDENCE_SATURATION = 48
+
+
+class AnomalyType(IntEnum):
+    """Integer ids for anomaly kinds, so scoring and chain lookups index by int"""
+    CPU_DEVIATION = 0
+    MEMORY_LEAK = 1
+    MEMORY_EXPLOSION = 2
+    NETWORK_BURST = 3
+    CHILD_EXPLOSION = 4
+    RESTART_LOOP = 5
+
+
+class Anomaly(NamedTuple):
+    """One detected deviation; still readable like the old dict (a["type"], a.get(...))"""
+    pid: int
+    process_name: str
+    type: str  # display/audit name
+    type_id: AnomalyType
+    deviation_ratio: float
+    severity_score: int
+    confidence_score: float
+    explanation: str
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._fields else default
+
+
 class AnomalyDetector:
     """
     Guardian Anomaly Detection Engine (Level 2)
@@ -13,133 +62,188 @@ class AnomalyDetector:
             "min_cpu_abs": 10.0, # %
             "min_net_abs": 500.0 # KB/s
         }
+        t = self.thresholds
+        # Read once here rather than looked up in the dict on every analyze() branch
+        self._limits = (t["cpu_multiplier"], t["ram_multiplier"], t["net_multiplier"],
+                        t["child_multiplier"], t["min_cpu_abs"], t["min_net_abs"])
 
     def analyze(self, fingerprint, baseline):
         """
         Analyzes a process fingerprint against its baseline.
-        Returns a list of structured anomaly objects.
+        Returns a list of Anomaly tuples.
         """
-        if not baseline or baseline.get("samples", 0) < 10:
+        if not baseline or baseline.samples < 10:
             # Not enough data to form a reliable baseline comparison
             return []
 
         anomalies = []
         name = fingerprint.name
         pid = fingerprint.pid
-        is_trusted = baseline.get("trusted", False)
+        is_trusted = baseline.trusted
+        cpu_mult, ram_mult, net_mult, child_mult, min_cpu_abs, min_net_abs = self._limits
+        cpu_ema = fingerprint.cpu_ema
+        ram_ema = fingerprint.ram_ema
 
         # 1. CPU Anomaly Detection
-        avg_cpu = max(baseline.get("avg_cpu", 1.0), 1.0)
+        avg_cpu = max(baseline.avg_cpu, 1.0)
         cpu_triggered = False
         
         # Standard anomaly
         if not is_trusted:
-            if fingerprint.cpu_ema > avg_cpu * self.thresholds["cpu_multiplier"] and fingerprint.cpu_ema > self.thresholds["min_cpu_abs"]:
+            if cpu_ema > avg_cpu * cpu_mult and cpu_ema > min_cpu_abs:
                 cpu_triggered = True
         # Hard limit for trusted
-        elif fingerprint.cpu_ema > 90.0:
+        elif cpu_ema > 90.0:
             cpu_triggered = True
 
         if cpu_triggered:
-            deviation = fingerprint.cpu_ema / avg_cpu if avg_cpu > 0 else 10.0
-            anomalies.append({
-                "pid": pid,
-                "process_name": name,
-                "type": "CPU_DEVIATION",
-                "deviation_ratio": round(deviation, 2),
-                "severity_score": 10 if is_trusted else min(10, int(deviation * 1.5)),
-                "confidence_score": 1.0 if is_trusted else self._calculate_confidence(baseline, duration_penalty=False),
-                "explanation": f"CRITICAL: Trusted process hit hard CPU limit ({fingerprint.cpu_ema:.1f}%)." if is_trusted else f"CPU usage ({fingerprint.cpu_ema:.1f}%) is {deviation:.1f}x higher than baseline ({avg_cpu:.1f}%)."
-            })
+            deviation = cpu_ema / avg_cpu if avg_cpu > 0 else 10.0
+            anomalies.append(Anomaly(
+                pid,
+                name,
+                "CPU_DEVIATION",
+                AnomalyType.CPU_DEVIATION,
+                round(deviation, 2),
+                10 if is_trusted else min(10, int(deviation * 1.5)),
+                1.0 if is_trusted else self._confidence_for(min(baseline.samples, _CONFIDENCE_SATURATION)),
+                f"CRITICAL: Trusted process hit hard CPU limit ({cpu_ema:.1f}%)." if is_trusted else f"CPU usage ({cpu_ema:.1f}%) is {deviation:.1f}x higher than baseline ({avg_cpu:.1f}%)."
+            ))
 
         # 2. RAM Leak / Growth Detection
         growth_rate = fingerprint.get_growth_rate()
-        avg_ram = max(baseline.get("avg_ram", 10.0), 10.0)
+        avg_ram = max(baseline.avg_ram, 10.0)
         
         # Trusted processes ignore leaks, only hit hard limit
         if not is_trusted:
             # Check for continuous growth (Leak)
-            if growth_rate > 1.0 and fingerprint.ram_ema > avg_ram * 1.2:
-                anomalies.append({
-                    "pid": pid,
-                    "process_name": name,
-                    "type": "MEMORY_LEAK",
-                    "deviation_ratio": round(growth_rate, 2),
-                    "severity_score": 6,
-                    "confidence_score": 0.8,
-                    "explanation": f"Sustained RAM growth detected ({growth_rate:.1f} MB/sample trend)."
-                })
+            if growth_rate > 1.0 and ram_ema > avg_ram * 1.2:
+                anomalies.append(Anomaly(
+                    pid,
+                    name,
+                    "MEMORY_LEAK",
+                    AnomalyType.MEMORY_LEAK,
+                    round(growth_rate, 2),
+                    6,
+                    0.8,
+                    f"Sustained RAM growth detected ({growth_rate:.1f} MB/sample trend)."
+                ))
         
         # RAM Explosion / Hard Limit (5GB = 5120MB)
         ram_triggered = False
         if not is_trusted:
-            if fingerprint.ram_ema > avg_ram * self.thresholds["ram_multiplier"]:
+            if ram_ema > avg_ram * ram_mult:
                 ram_triggered = True
-        elif fingerprint.ram_ema > 5120.0:
+        elif ram_ema > 5120.0:
             ram_triggered = True
 
         if ram_triggered:
-            deviation = fingerprint.ram_ema / avg_ram if avg_ram > 0 else 10.0
-            anomalies.append({
-                "pid": pid,
-                "process_name": name,
-                "type": "MEMORY_EXPLOSION",
-                "deviation_ratio": round(deviation, 2),
-                "severity_score": 10 if is_trusted else 7,
-                "confidence_score": 1.0 if is_trusted else 0.9,
-                "explanation": f"CRITICAL: Trusted process hit hard RAM limit ({fingerprint.ram_ema:.0f} MB)." if is_trusted else f"RAM usage ({fingerprint.ram_ema:.0f} MB) is {deviation:.1f}x higher than baseline ({avg_ram:.0f} MB)."
-            })
+            deviation = ram_ema / avg_ram if avg_ram > 0 else 10.0
+            anomalies.append(Anomaly(
+                pid,
+                name,
+                "MEMORY_EXPLOSION",
+                AnomalyType.MEMORY_EXPLOSION,
+                round(deviation, 2),
+                10 if is_trusted else 7,
+                1.0 if is_trusted else 0.9,
+                f"CRITICAL: Trusted process hit hard RAM limit ({ram_ema:.0f} MB)." if is_trusted else f"RAM usage ({ram_ema:.0f} MB) is {deviation:.1f}x higher than baseline ({avg_ram:.0f} MB)."
+            ))
 
         # 3. Network Anomaly Detection (Ignored for trusted unless we want hard limits there too)
         if not is_trusted:
-            avg_net_sent = max(baseline.get("avg_net_sent", 0.0), 10.0)
-            if fingerprint.net_sent_ema > avg_net_sent * self.thresholds["net_multiplier"] and fingerprint.net_sent_ema > self.thresholds["min_net_abs"]:
+            avg_net_sent = max(baseline.avg_net_sent, 10.0)
+            if fingerprint.net_sent_ema > avg_net_sent * net_mult and fingerprint.net_sent_ema > min_net_abs:
                 deviation = fingerprint.net_sent_ema / avg_net_sent
-                anomalies.append({
-                    "pid": pid,
-                    "process_name": name,
-                    "type": "NETWORK_BURST",
-                    "deviation_ratio": round(deviation, 2),
-                    "severity_score": 8,
-                    "confidence_score": 0.85,
-                    "explanation": f"Outbound network flow ({fingerprint.net_sent_ema:.1f} KB/s) is {deviation:.1f}x higher than baseline ({avg_net_sent:.1f} KB/s)."
-                })
+                anomalies.append(Anomaly(
+                    pid,
+                    name,
+                    "NETWORK_BURST",
+                    AnomalyType.NETWORK_BURST,
+                    round(deviation, 2),
+                    8,
+                    0.85,
+                    f"Outbound network flow ({fingerprint.net_sent_ema:.1f} KB/s) is {deviation:.1f}x higher than baseline ({avg_net_sent:.1f} KB/s)."
+                ))
 
         # 4. Child Proliferation (Ignored for trusted)
         if not is_trusted:
-            avg_children = max(baseline.get("avg_children", 0.0), 1.0)
+            avg_children = max(baseline.avg_children, 1.0)
             curr_children = fingerprint.child_counts[-1] if fingerprint.child_counts else 0
-            if curr_children > avg_children * self.thresholds["child_multiplier"] and curr_children > avg_children + 3:
+            if curr_children > avg_children * child_mult and curr_children > avg_children + 3:
                 deviation = curr_children / avg_children
-                anomalies.append({
-                    "pid": pid,
-                    "process_name": name,
-                    "type": "CHILD_EXPLOSION",
-                    "deviation_ratio": round(deviation, 2),
-                    "severity_score": 9,
-                    "confidence_score": 0.95,
-                    "explanation": f"Process spawned {curr_children} children (Typical: ~{avg_children:.1f})."
-                })
+                anomalies.append(Anomaly(
+                    pid,
+                    name,
+                    "CHILD_EXPLOSION",
+                    AnomalyType.CHILD_EXPLOSION,
+                    round(deviation, 2),
+                    9,
+                    0.95,
+                    f"Process spawned {curr_children} children (Typical: ~{avg_children:.1f})."
+                ))
 
         # 5. Respawn Loops (Restart Frequency)
         # Restart loops are detected via baseline.restart_count > threshold
-        if baseline.get("restart_count", 0) > 5:
-            anomalies.append({
-                "pid": pid,
-                "process_name": name,
-                "type": "RESTART_LOOP",
-                "deviation_ratio": float(baseline["restart_count"]),
-                "severity_score": 10,
-                "confidence_score": 1.0,
-                "explanation": f"Process instability: detected {baseline['restart_count']} restarts in a short window."
-            })
+        if baseline.restart_count > 5:
+            anomalies.append(Anomaly(
+                pid,
+                name,
+                "RESTART_LOOP",
+                AnomalyType.RESTART_LOOP,
+                float(baseline.restart_count),
+                10,
+                1.0,
+                f"Process instability: detected {baseline.restart_count} restarts in a short window."
+            ))
 
         return anomalies
 
-    def _calculate_confidence(self, baseline, duration_penalty=True):
+    def analyze_batch(self, fingerprints, baselines):
+        """
+        analyze() for every (fingerprint, baseline) pair of a telemetry tick.
+        With NumPy the threshold tests run as one vectorized pass and only the
+        rows that can trip something go through analyze().
+        """
+        n = len(fingerprints)
+        if np is None or n < _MIN_BATCH:
+            return [self.analyze(fp, b) for fp, b in zip(fingerprints, baselines)]
+
+        # One row per process; float64 so comparisons match analyze() exactly
+        cols = np.array([
+            (fp.cpu_ema, fp.ram_ema, fp.net_sent_ema, fp.child_counts[-1] if fp.child_counts else 0,
+             b.avg_cpu, b.avg_ram, b.avg_net_sent, b.avg_children, b.restart_count, b.trusted, b.samples)
+            if b else (0.0,) * 11
+            for fp, b in zip(fingerprints, baselines)
+        ], dtype=np.float64).T
+        cpu, ram, net, children, avg_cpu, avg_ram, avg_net, avg_children, restarts, trusted, samples = cols
+        avg_cpu = np.maximum(avg_cpu, 1.0)
+        avg_ram = np.maximum(avg_ram, 10.0)
+        avg_net = np.maximum(avg_net, 10.0)
+        avg_children = np.maximum(avg_children, 1.0)
+        # The same snapshot analyze() checks against, so the prefilter never disagrees with it
+        cpu_mult, ram_mult, net_mult, child_mult, min_cpu_abs, min_net_abs = self._limits
+
+        # Superset of analyze()'s conditions: the leak check's 1.2x RAM floor
+        # stands in for the growth-rate test, which analyze() then makes exact
+        untrusted_hit = (
+            ((cpu > avg_cpu * cpu_mult) & (cpu > min_cpu_abs))
+            | (ram > avg_ram * min(1.2, ram_mult))
+            | ((net > avg_net * net_mult) & (net > min_net_abs))
+            | ((children > avg_children * child_mult) & (children > avg_children + 3))
+        )
+        trusted_hit = (cpu > 90.0) | (ram > 5120.0)
+        candidates = (samples >= 10) & (np.where(trusted != 0, trusted_hit, untrusted_hit) | (restarts > 5))
+
+        results = [[] for _ in range(n)]
+        for i in np.flatnonzero(candidates):
+            results[i] = self.analyze(fingerprints[i], baselines[i])
+        return results
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _confidence_for(samples):
         """
         Calculates confidence based on baseline sample size.
+        Callers clamp samples to _CONFIDENCE_SATURATION, so each value is computed once.
         """
-        samples = baseline.get("samples", 0)
-        confidence = min(0.5 + (samples / 100), 0.98)
-        return round(confidence, 2)
+        return round(min(0.5 + (samples / 100), 0.98), 2)
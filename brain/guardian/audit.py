@@ -1,55 +1,218 @@
+import atexit
 import json
 import os
+import threading
 import time
+from collections import deque
+
+try:
+    import orjson  # Optional: faster encoding/decoding of audit lines
+except ImportError:
+    orjson = None
+
+# Events kept in memory and on disk after compaction
+MAX_EVENTS = 1000
+# Appends between compactions of the JSON-Lines file
+COMPACT_EVERY = 5000
+
+
+def _encode(event):
+    """One compact JSON line, as bytes"""
+    if orjson is not None:
+        return orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(event) + "\n").encode("utf-8")
+
+
+def _decode(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
 
 class AuditEngine:
-    def __init__(self, persistence_path="fluffy_data/guardian/audit.json"):
+    """
+    Guardian audit trail, stored as JSON Lines: each event is appended as one
+    line and the file is periodically compacted to the last MAX_EVENTS.
+    Past events are only read back when history is requested or at compaction.
+    """
+    def __init__(self, persistence_path="fluffy_data/guardian/audit.jsonl", flush_interval=30.0):
         self.path = persistence_path
-        self.events = []
-        self._load()
+        self._dir_ready = False  # parent dir exists; cleared again when a write fails
+        self.events = None  # last MAX_EVENTS, loaded on first use (see _ensure_loaded)
+        self._by_process = {}  # process name -> its events, oldest first
+        self._lock = threading.Lock()
+        self._fh = None  # append handle, opened on first event
+        self._appends = 0  # lines appended since the last compaction
+        self._dirty_since = None  # time of the first event not yet flushed
+        self._flush_interval = flush_interval
+        if not os.path.exists(self.path) and os.path.exists(self._legacy_path()):
+            self._load()  # migrate the old JSON array before anything is appended after it
+
+        # Writes happen on a timer (and at exit), not on the logging path
+        threading.Thread(target=self._flush_loop, name="guardian-audit-flush", daemon=True).start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self._flush_interval)
+            self.flush()
+
+    def flush(self):
+        """Push buffered appends to disk if anything was logged since the last flush"""
+        with self._lock:
+            if self._dirty_since is None or self._fh is None:
+                return
+            try:
+                self._fh.flush()
+                self._dirty_since = None
+            except Exception as e:
+                print(f"[Guardian] Failed to flush audit trail: {e}")
+
+    def _legacy_path(self):
+        legacy = os.path.splitext(self.path)[0] + ".json"
+        return None if legacy == self.path else legacy
+
+    def _ensure_loaded(self):
+        """Read past events in if that hasn't happened yet (caller holds the lock)"""
+        if self.events is None:
+            if self._fh is not None:
+                self._fh.flush()  # make this run's buffered appends part of the read
+            self._load()
 
     def _load(self):
-        if os.path.exists(self.path):
+        path = self.path
+        legacy = self._legacy_path()
+        self._index(())
+        if not os.path.exists(path) and legacy and os.path.exists(legacy):
+            # Trail from before the JSON-Lines format: a single JSON array
             try:
-                with open(self.path, "r") as f:
-                    self.events = json.load(f)
-                    # Keep only last 1000 events for performance
-                    self.events = self.events[-1000:]
+                with open(legacy, "rb") as f:
+                    self._index(_decode(f.read())[-MAX_EVENTS:])
+                self._appends = COMPACT_EVERY  # rewrite it as JSON Lines on the first event
+            except Exception as e:
+                print(f"[Guardian] Failed to load audit trail: {e}")
+            return
+        if os.path.exists(path):
+            try:
+                events = []
+                with open(path, "rb") as f:
+                    # Only the last MAX_EVENTS lines are kept, so only those get decoded
+                    for line in deque(f, maxlen=MAX_EVENTS):
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            events.append(_decode(line))
+                        except ValueError:
+                            continue  # torn last line from an interrupted write
+                self._index(events)
             except Exception as e:
                 print(f"[Guardian] Failed to load audit trail: {e}")
 
-    def save(self):
-        try:
+    def _index(self, events):
+        self.events = deque(events, maxlen=MAX_EVENTS)
+        self._by_process = {}
+        for e in self.events:
+            self._by_process.setdefault(e.get("process"), deque()).append(e)
+
+    def _compact(self):
+        """Rewrite the file as the last MAX_EVENTS lines (caller holds the lock)"""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if not self._dir_ready:
             os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            with open(self.path, "w") as f:
-                json.dump(self.events[-1000:], f, indent=2)
-        except Exception as e:
-            print(f"[Guardian] Failed to save audit trail: {e}")
+            self._dir_ready = True
+        data = b"".join(_encode(e) for e in self.events)
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._appends = 0
+        self._dirty_since = None
 
-    def log_event(self, event_type, process_name, details):
+    def save(self):
+        """Write the trail out in full (compacted)"""
+        with self._lock:
+            try:
+                if self.events is None:
+                    # Never read back this run, so the file already holds every event
+                    if self._fh is not None:
+                        self._fh.flush()
+                        self._dirty_since = None
+                    return
+                self._compact()
+            except Exception as e:
+                print(f"[Guardian] Failed to save audit trail: {e}")
+                self._dir_ready = False
+
+    def log_event(self, event_type, process_name, details, now=None):
         """
         Records an event in the audit trail.
         event_type: 'Alert', 'Intervention', 'UserDecision', 'System'
+        now: event timestamp (defaults to time.time()).
         """
         event = {
-            "timestamp": time.time(),
+            "timestamp": time.time() if now is None else now,
             "type": event_type,
             "process": process_name,
             "details": details
         }
+        line = _encode(event)
+        with self._lock:
+            try:
+                compact = self._appends >= COMPACT_EVERY
+                if compact:
+                    self._ensure_loaded()  # before the event is kept, so it isn't read back twice
+                if self.events is not None:
+                    self._remember(event)
+                if compact:
+                    self._compact()
+                    return
+                if self._fh is None:
+                    if not self._dir_ready:
+                        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                        self._dir_ready = True
+                    self._fh = open(self.path, "ab", buffering=64 * 1024)
+                self._fh.write(line)
+                self._appends += 1
+                if self._dirty_since is None:
+                    self._dirty_since = event["timestamp"]
+            except Exception as e:
+                print(f"[Guardian] Failed to append audit event: {e}")
+                self._dir_ready = False  # the directory may have been removed; recreate next time
+
+    def _remember(self, event):
+        """Add to the in-memory window and index (caller holds the lock)"""
+        if len(self.events) == MAX_EVENTS:
+            # The deque is about to drop its oldest event; drop it from the index too
+            oldest = self.events[0]
+            history = self._by_process.get(oldest.get("process"))
+            if history:
+                history.popleft()
+                if not history:
+                    del self._by_process[oldest.get("process")]
         self.events.append(event)
-        
-        # Periodic flush (every 50 events to reduce IO)
-        if len(self.events) % 50 == 0:
-            self.save()
+        self._by_process.setdefault(event["process"], deque()).append(event)
 
     def get_history(self, process_name=None):
-        if process_name:
-            return [e for e in self.events if e["process"] == process_name]
-        return self.events
+        with self._lock:
+            self._ensure_loaded()
+            if process_name:
+                return list(self._by_process.get(process_name, ()))
+            return list(self.events)
 
     def clear_all_data(self):
-        self.events = []
+        with self._lock:
+            self.events = deque(maxlen=MAX_EVENTS)
+            self._by_process = {}
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
         if os.path.exists(self.path):
             try:
                 os.remove(self.path)
@@ -1,6 +1,68 @@
 import json
 import os
 import time
+from collections import Counter
+
+try:
+    import orjson  # Optional: faster load/save of the baselines file
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np  # Optional: vectorized EMA updates across a whole tick
+except ImportError:
+    np = None
+
+# Below this many rows a plain loop beats the NumPy setup cost
+_MIN_BATCH = 32
+
+
+class Baseline:
+    """
+    Learned profile of one process name. Slotted (it is long-lived and updated
+    every tick) but still readable like the old dict (b.avg_cpu, b.get(...)).
+    """
+    __slots__ = ("avg_cpu", "peak_cpu", "avg_ram", "peak_ram", "ram_growth_rate",
+                 "avg_children", "child_spawn_rate", "avg_net_sent", "avg_net_received",
+                 "avg_lifespan", "samples", "first_seen", "last_seen", "restart_count", "trusted")
+
+    def __init__(self, avg_cpu=0.0, peak_cpu=0.0, avg_ram=0.0, peak_ram=0.0, ram_growth_rate=0.0,
+                 avg_children=0.0, child_spawn_rate=0.0, avg_net_sent=0.0, avg_net_received=0.0,
+                 avg_lifespan=0.0, samples=1, first_seen=None, last_seen=None, restart_count=0,
+                 trusted=False):
+        now = time.time()
+        self.avg_cpu = avg_cpu
+        self.peak_cpu = peak_cpu
+        self.avg_ram = avg_ram
+        self.peak_ram = peak_ram
+        self.ram_growth_rate = ram_growth_rate
+        self.avg_children = avg_children
+        self.child_spawn_rate = child_spawn_rate
+        self.avg_net_sent = avg_net_sent
+        self.avg_net_received = avg_net_received
+        self.avg_lifespan = avg_lifespan
+        self.samples = samples
+        self.first_seen = now if first_seen is None else first_seen
+        self.last_seen = now if last_seen is None else last_seen
+        self.restart_count = restart_count
+        self.trusted = trusted
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from the persisted form; fields missing in older files keep their defaults"""
+        return cls(**{k: v for k, v in data.items() if k in cls.__slots__})
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
 
 class BaselineEngine:
     """
@@ -9,110 +71,180 @@ class BaselineEngine:
     """
     def __init__(self, persistence_path="fluffy_data/guardian/baselines.json", alpha=0.01):
         self.path = persistence_path
+        self._dir_ready = False  # makedirs already done for self.path
         self.alpha = alpha  # Very slow adaptation (Level 2 requires stability)
         self.baselines = self._load()
 
     def _load(self):
         if os.path.exists(self.path):
             try:
-                with open(self.path, "r") as f:
-                    data = json.load(f)
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+                    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
                     # Ensure metadata is present
                     if "_metadata" not in data:
                         data["_metadata"] = {"system_first_run": time.time()}
-                    return data
+                    return {
+                        name: entry if name == "_metadata" else Baseline.from_dict(entry)
+                        for name, entry in data.items()
+                    }
             except Exception:
                 return {"_metadata": {"system_first_run": time.time()}}
         return {"_metadata": {"system_first_run": time.time()}}
 
     def save(self):
+        tmp_path = self.path + ".tmp"
         try:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            with open(self.path, "w") as f:
-                json.dump(self.baselines, f, indent=2)
+            if not self._dir_ready:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._dir_ready = True
+            payload = {
+                name: entry if name == "_metadata" else entry.to_dict()
+                for name, entry in self.baselines.items()
+            }
+            if orjson is not None:
+                data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(payload, indent=2).encode("utf-8")
+            # Write a sibling file and swap it in so a crash mid-write can't wipe learned baselines
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
         except Exception as e:
             # Using stderr for silent logging in dev
             import sys
             print(f"[Guardian] Failed to save baselines: {e}", file=sys.stderr)
+            self._dir_ready = False
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
-    def update(self, process_name, cpu, ram, child_count, net_sent=0.0, net_received=0.0, lifespan=0):
+    def update(self, process_name, cpu, ram, child_count, net_sent=0.0, net_received=0.0, lifespan=0, now=None):
         """
         Updates the baseline for a process using exponential moving averages.
+        now: timestamp of the telemetry tick (defaults to time.time()).
         """
+        if now is None:
+            now = time.time()
         if process_name not in self.baselines:
             # Initial baseline (Level 2: seeded with first observation)
-            self.baselines[process_name] = {
-                "avg_cpu": float(cpu),
-                "peak_cpu": float(cpu),
-                "avg_ram": float(ram),
-                "peak_ram": float(ram),
-                "ram_growth_rate": 0.0,
-                "avg_children": float(child_count),
-                "child_spawn_rate": 0.0,
-                "avg_net_sent": float(net_sent),
-                "avg_net_received": float(net_received),
-                "avg_lifespan": float(lifespan),
-                "samples": 1,
-                "first_seen": time.time(),
-                "last_seen": time.time(),
-                "restart_count": 0,
-                "trusted": False
-            }
+            self.baselines[process_name] = Baseline(
+                avg_cpu=float(cpu),
+                peak_cpu=float(cpu),
+                avg_ram=float(ram),
+                peak_ram=float(ram),
+                avg_children=float(child_count),
+                avg_net_sent=float(net_sent),
+                avg_net_received=float(net_received),
+                avg_lifespan=float(lifespan),
+                first_seen=now,
+                last_seen=now
+            )
         else:
             b = self.baselines[process_name]
-            
-            # Migration: Add missing fields for legacy baselines
-            if "avg_cpu" not in b: b["avg_cpu"] = cpu
-            if "peak_cpu" not in b: b["peak_cpu"] = cpu
-            if "avg_ram" not in b: b["avg_ram"] = ram
-            if "peak_ram" not in b: b["peak_ram"] = ram
-            if "ram_growth_rate" not in b: b["ram_growth_rate"] = 0.0
-            if "avg_children" not in b: b["avg_children"] = float(child_count)
-            if "child_spawn_rate" not in b: b["child_spawn_rate"] = 0.0
-            if "avg_net_sent" not in b: b["avg_net_sent"] = 0.0
-            if "avg_net_received" not in b: b["avg_net_received"] = 0.0
-            if "avg_lifespan" not in b: b["avg_lifespan"] = 0.0
-            if "samples" not in b: b["samples"] = 1
-            if "restart_count" not in b: b["restart_count"] = 0
-            if "trusted" not in b: b["trusted"] = False
+            alpha = self.alpha
 
             # EMA Updates (Deterministic and explainable slow adaptation)
-            b["avg_cpu"] = (self.alpha * cpu) + ((1 - self.alpha) * b["avg_cpu"])
-            b["peak_cpu"] = max(b["peak_cpu"], cpu)
+            # A zero delta leaves the average unchanged, so idle processes skip the store
+            d = cpu - b.avg_cpu
+            if d:
+                b.avg_cpu += alpha * d
+            if cpu > b.peak_cpu:
+                b.peak_cpu = cpu
             
             # RAM Adaptation
-            old_ram = b["avg_ram"]
-            b["avg_ram"] = (self.alpha * ram) + ((1 - self.alpha) * b["avg_ram"])
-            b["peak_ram"] = max(b["peak_ram"], ram)
+            current_growth = ram - b.avg_ram  # Delta against the average before this update
+            if current_growth:
+                b.avg_ram += alpha * current_growth
+            if ram > b.peak_ram:
+                b.peak_ram = ram
             
             # Growth Rate (Delta between observations smoothed)
-            current_growth = ram - old_ram
-            b["ram_growth_rate"] = (self.alpha * current_growth) + ((1 - self.alpha) * b["ram_growth_rate"])
+            d = current_growth - b.ram_growth_rate
+            if d:
+                b.ram_growth_rate += alpha * d
             
             # Children
-            b["avg_children"] = (self.alpha * child_count) + ((1 - self.alpha) * b["avg_children"])
+            d = child_count - b.avg_children
+            if d:
+                b.avg_children += alpha * d
             
             # Network
-            b["avg_net_sent"] = (self.alpha * net_sent) + ((1 - self.alpha) * b["avg_net_sent"])
-            b["avg_net_received"] = (self.alpha * net_received) + ((1 - self.alpha) * b["avg_net_received"])
+            d = net_sent - b.avg_net_sent
+            if d:
+                b.avg_net_sent += alpha * d
+            d = net_received - b.avg_net_received
+            if d:
+                b.avg_net_received += alpha * d
             
             # Lifespan (if process ended, tracked via listener)
             if lifespan > 0:
-                b["avg_lifespan"] = (self.alpha * lifespan) + ((1 - self.alpha) * b["avg_lifespan"])
+                b.avg_lifespan += alpha * (lifespan - b.avg_lifespan)
+
+            b.samples += 1
+            b.last_seen = now
+
+    def update_many(self, names, cpu, ram, child_count, net_sent, net_received, now=None):
+        """
+        update() for a whole telemetry tick (parallel sequences, one entry per process).
+        With NumPy the EMA arithmetic for known names seen once this tick runs as one
+        vectorized pass; first sightings and repeated names go through update() so
+        they keep its one-observation-at-a-time semantics.
+        """
+        if now is None:
+            now = time.time()
+        if np is None or len(names) < _MIN_BATCH:
+            for row in zip(names, cpu, ram, child_count, net_sent, net_received):
+                self.update(*row, now=now)
+            return
+
+        seen = Counter(names)
+        batch = [i for i, name in enumerate(names) if seen[name] == 1 and name in self.baselines]
+        in_batch = set(batch)
+        rows = [self.baselines[names[i]] for i in batch]
+
+        if rows:
+            x_cpu, x_ram, x_children, x_sent, x_recv = np.array(
+                [(cpu[i], ram[i], child_count[i], net_sent[i], net_received[i]) for i in batch],
+                dtype=np.float64
+            ).T
+            avg_cpu, peak_cpu, avg_ram, peak_ram, growth, avg_children, avg_sent, avg_recv = np.array(
+                [(b.avg_cpu, b.peak_cpu, b.avg_ram, b.peak_ram, b.ram_growth_rate,
+                  b.avg_children, b.avg_net_sent, b.avg_net_received) for b in rows],
+                dtype=np.float64
+            ).T
+            alpha = self.alpha
+            columns = np.column_stack((
+                avg_cpu + alpha * (x_cpu - avg_cpu),
+                np.maximum(peak_cpu, x_cpu),
+                avg_ram + alpha * (x_ram - avg_ram),
+                np.maximum(peak_ram, x_ram),
+                growth + alpha * ((x_ram - avg_ram) - growth),
+                avg_children + alpha * (x_children - avg_children),
+                avg_sent + alpha * (x_sent - avg_sent),
+                avg_recv + alpha * (x_recv - avg_recv),
+            )).tolist()
+            for b, values in zip(rows, columns):
+                (b.avg_cpu, b.peak_cpu, b.avg_ram, b.peak_ram, b.ram_growth_rate,
+                 b.avg_children, b.avg_net_sent, b.avg_net_received) = values
+                b.samples += 1
+                b.last_seen = now
 
-            b["samples"] += 1
-            b["last_seen"] = time.time()
+        for i, name in enumerate(names):
+            if i not in in_batch:
+                self.update(name, cpu[i], ram[i], child_count[i], net_sent[i], net_received[i], now=now)
 
     def get_baseline(self, process_name):
         return self.baselines.get(process_name)
 
     def increment_restart(self, process_name):
         if process_name in self.baselines:
-            self.baselines[process_name]["restart_count"] += 1
+            self.baselines[process_name].restart_count += 1
 
     def mark_trusted(self, process_name):
         if process_name in self.baselines:
-            self.baselines[process_name]["trusted"] = True
+            self.baselines[process_name].trusted = True
             self.save()
 
     def clear_all_data(self):
@@ -1,49 +1,67 @@
 import time
+from collections import Counter, deque
+
+from guardian.anomaly import AnomalyType
 
 class BehavioralChain:
     """
     Tracks sequences of suspicious behavior over time for a single process (Level 2).
     """
+    # Intent patterns: anomaly types that must all be present in the window
+    _P_EXFIL = frozenset({AnomalyType.CHILD_EXPLOSION, AnomalyType.CPU_DEVIATION, AnomalyType.NETWORK_BURST})
+    _P_HIJACK_A = frozenset({AnomalyType.MEMORY_LEAK, AnomalyType.RESTART_LOOP})
+    _P_HIJACK_B = frozenset({AnomalyType.MEMORY_EXPLOSION, AnomalyType.RESTART_LOOP})
+
     def __init__(self, pid, name, timeout=300):
         self.pid = pid
         self.name = name
-        self.events = [] # List of (timestamp, anomaly_type)
+        self.events = deque() # (timestamp, anomaly_type), oldest first
+        self._counts = Counter() # AnomalyType -> occurrences still inside the window
         self.timeout = timeout # 5 minutes default
         self.suspicion_multiplier = 1.0
 
-    def add_event(self, anomaly_type):
+    def add_event(self, anomaly_type, now=None):
         """
         Adds an anomaly event to the chain and cleans up expired events.
         """
-        now = time.time()
+        if now is None:
+            now = time.time()
         self.events.append((now, anomaly_type))
+        self._counts[anomaly_type] += 1
         self._cleanup(now)
         
         # Level 2 chain logic: increase multiplier if specific sequences occur
         self.suspicion_multiplier = self._evaluate_intent()
 
     def _cleanup(self, now):
-        self.events = [e for e in self.events if now - e[0] < self.timeout]
+        events = self.events
+        counts = self._counts
+        while events and now - events[0][0] >= self.timeout:
+            _, expired = events.popleft()
+            counts[expired] -= 1
+            if not counts[expired]:
+                del counts[expired]
 
     def _evaluate_intent(self):
         """
         Analyzes the event chain for specific intent patterns.
         """
-        types = [e[1] for e in self.events]
+        c = self._counts
+        present = frozenset(c)  # types with at least one event in the window
         
         # Pattern 1: Data Exfiltration Attempt (Spawn -> High CPU -> Network Burst)
-        if "CHILD_EXPLOSION" in types and "CPU_DEVIATION" in types and "NETWORK_BURST" in types:
+        if self._P_EXFIL <= present:
             return 2.5
         
         # Pattern 2: Resource Hijack / Leak (RAM Explosion -> Restart Loop)
-        if ("MEMORY_LEAK" in types or "MEMORY_EXPLOSION" in types) and "RESTART_LOOP" in types:
+        if self._P_HIJACK_A <= present or self._P_HIJACK_B <= present:
             return 2.0
         
         # Pattern 3: Rapid Proliferation
-        if types.count("CHILD_EXPLOSION") > 2:
+        if c[AnomalyType.CHILD_EXPLOSION] > 2:
             return 1.8
             
-        return 1.0 + (len(set(types)) * 0.1) # Baseline multiplier for variety of behavior
+        return 1.0 + (len(present) * 0.1) # Baseline multiplier for variety of behavior
 
 class ChainManager:
     """
@@ -52,7 +70,7 @@ class ChainManager:
     def __init__(self):
         self.chains = {} # PID -> BehavioralChain
 
-    def update(self, pid, name, anomalies):
+    def update(self, pid, name, anomalies, now=None):
         if not anomalies:
             return 1.0
             
@@ -60,14 +78,17 @@ class ChainManager:
             self.chains[pid] = BehavioralChain(pid, name)
             
         chain = self.chains[pid]
+        if now is None:
+            now = time.time()
         for a in anomalies:
-            chain.add_event(a["type"])
+            chain.add_event(a["type_id"], now)
             
         return chain.suspicion_multiplier
 
     def cleanup(self, active_pids):
-        dead_pids = [pid for pid in self.chains if pid not in active_pids]
-        for pid in dead_pids:
+        if not isinstance(active_pids, (set, frozenset)):
+            active_pids = set(active_pids)
+        for pid in self.chains.keys() - active_pids:
             del self.chains[pid]
 
     def clear_all_data(self):
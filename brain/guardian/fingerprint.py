@@ -1,11 +1,12 @@
 import time
+from collections import deque
 
 class BehavioralFingerprint:
     """
     Tracks the real-time behavioral fingerprint of a running process (Level 2).
     Uses Exponential Moving Averages (EMA) and rolling windows for trend detection.
     """
-    def __init__(self, pid, name, alpha=0.3):
+    def __init__(self, pid, name, alpha=0.3, now=None):
         self.pid = pid
         self.name = name
         self.alpha = alpha  # Faster adaptation for live fingerprinting vs long-term baseline
@@ -17,30 +18,41 @@ class BehavioralFingerprint:
         self.net_recv_ema = 0.0
         
         # Tendency Tracking
-        self.ram_samples = []
-        self.child_counts = []
-        self.start_time = time.time()
-        self.last_update = time.time()
+        self.ram_samples = deque(maxlen=20)
+        self.child_counts = deque(maxlen=10)  # read by the anomaly detector every tick
+        self.start_time = time.time() if now is None else now
+        self.last_update = self.start_time
         
         # Flags
         self.is_decaying = False
 
-    def update(self, cpu, ram, net_sent, net_recv, child_count):
+    def update(self, cpu, ram, net_sent, net_recv, child_count, now=None):
         """
         Updates the fingerprint with new telemetry.
+        now: timestamp of the telemetry tick (defaults to time.time()).
         """
-        now = time.time()
+        if now is None:
+            now = time.time()
         delta_t = now - self.last_update
         
-        # 1. EMA Updates for Spike Smoothing
-        self.cpu_ema = (self.alpha * cpu) + ((1 - self.alpha) * self.cpu_ema)
-        self.ram_ema = (self.alpha * ram) + ((1 - self.alpha) * self.ram_ema)
-        self.net_sent_ema = (self.alpha * net_sent) + ((1 - self.alpha) * self.net_sent_ema)
-        self.net_recv_ema = (self.alpha * net_recv) + ((1 - self.alpha) * self.net_recv_ema)
+        # 1. EMA Updates for Spike Smoothing (m += alpha * (x - m), skipped when x == m)
+        alpha = self.alpha
+        d = cpu - self.cpu_ema
+        if d:
+            self.cpu_ema += alpha * d
+        d = ram - self.ram_ema
+        if d:
+            self.ram_ema += alpha * d
+        d = net_sent - self.net_sent_ema
+        if d:
+            self.net_sent_ema += alpha * d
+        d = net_recv - self.net_recv_ema
+        if d:
+            self.net_recv_ema += alpha * d
         
         # 2. Rolling Windows (Limited size for low CPU overhead)
-        self.ram_samples = (self.ram_samples + [ram])[-20:]
-        self.child_counts = (self.child_counts + [child_count])[-10:]
+        self.ram_samples.append(ram)
+        self.child_counts.append(child_count)
         
         self.last_update = now
 
@@ -64,18 +76,19 @@ class FingerprintManager:
     def __init__(self):
         self.fingerprints = {} # PID -> BehavioralFingerprint
 
-    def track(self, pid, name, cpu, ram, net_sent, net_recv, child_count):
+    def track(self, pid, name, cpu, ram, net_sent, net_recv, child_count, now=None):
         if pid not in self.fingerprints:
-            self.fingerprints[pid] = BehavioralFingerprint(pid, name)
+            self.fingerprints[pid] = BehavioralFingerprint(pid, name, now=now)
         
         fp = self.fingerprints[pid]
-        fp.update(cpu, ram, net_sent, net_recv, child_count)
+        fp.update(cpu, ram, net_sent, net_recv, child_count, now)
         return fp
 
     def cleanup(self, active_pids):
         """
         Removes fingerprints for processes that are no longer active.
         """
-        dead_pids = [pid for pid in self.fingerprints if pid not in active_pids]
-        for pid in dead_pids:
+        if not isinstance(active_pids, (set, frozenset)):
+            active_pids = set(active_pids)
+        for pid in self.fingerprints.keys() - active_pids:
             del self.fingerprints[pid]
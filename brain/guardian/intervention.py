@@ -1,3 +1,4 @@
+from bisect import bisect_right
 from enum import IntEnum
 
 class InterventionLevel(IntEnum):
@@ -18,23 +19,23 @@ class InterventionEngine:
                 InterventionLevel.REQUEST_PERMISSION: 12
             }
         self.thresholds = thresholds
+        # Sorted once here so get_level is a bisect instead of a sort per call
+        pairs = sorted(thresholds.items(), key=lambda x: x[1])
+        self._ths = tuple(t for _, t in pairs)
+        self._levels = tuple(level for level, _ in pairs)
 
     def get_level(self, score):
         # Determine highest applicable level
-        current_level = InterventionLevel.OBSERVE
-        for level, threshold in sorted(self.thresholds.items(), key=lambda x: x[1]):
-            if score >= threshold:
-                current_level = level
-            else:
-                break
-        return current_level
+        i = bisect_right(self._ths, score) - 1
+        return self._levels[i] if i >= 0 else InterventionLevel.OBSERVE
 
-    def get_action_recommendation(self, process_name, anomalies, level):
+    def get_action_recommendation(self, process_name, anomalies, level, primary=None):
         if level < InterventionLevel.RECOMMEND:
             return None
         
-        # Identify primary threat for recommendation text
-        primary = anomalies[0] if anomalies else {"type": "UNKNOWN"}
+        # Identify primary threat for recommendation text (RiskScorer.last_primary when given)
+        if primary is None:
+            primary = anomalies[0] if anomalies else {"type": "UNKNOWN"}
         
         reason = f"due to {primary.get('type','anomaly').replace('_',' ')} ({primary.get('actual','N/A')} vs typical {primary.get('baseline','N/A')})"
         
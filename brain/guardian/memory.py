@@ -1,66 +1,122 @@
+import atexit
 import json
 import os
+import threading
+
+try:
+    import orjson  # Optional: faster load/save of the memory file
+except ImportError:
+    orjson = None
+
+# Tag bits in GuardianMemory.names (ignored can be combined with the others)
+TRUSTED = 1
+DANGEROUS = 2
+IGNORED = 4
 
 class GuardianMemory:
-    def __init__(self, persistence_path="fluffy_data/guardian/memory.json"):
+    def __init__(self, persistence_path="fluffy_data/guardian/memory.json", save_delay=1.0):
         self.path = persistence_path
-        self.trusted_names = set()
-        self.dangerous_names = set()
-        self.ignored_names = set()
+        self._dir_ready = False
+        self.names = {}  # process name -> TRUSTED / DANGEROUS / IGNORED bits
+        self._lock = threading.Lock()
+        self._save_delay = save_delay
+        self._save_timer = None  # pending debounced save, if any
         self._load()
+        atexit.register(self.flush)
 
     def _load(self):
         if os.path.exists(self.path):
             try:
-                with open(self.path, "r") as f:
-                    data = json.load(f)
-                    self.trusted_names = set(data.get("trusted", []))
-                    self.dangerous_names = set(data.get("dangerous", []))
-                    self.ignored_names = set(data.get("ignored", []))
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+                    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                names = {}
+                for key, tag in (("trusted", TRUSTED), ("dangerous", DANGEROUS), ("ignored", IGNORED)):
+                    for name in data.get(key, []):
+                        names[name] = names.get(name, 0) | tag
+                self.names = names
             except Exception as e:
                 print(f"[Guardian] Failed to load memory: {e}")
 
     def save(self):
+        tmp_path = self.path + ".tmp"
         try:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            with open(self.path, "w") as f:
-                json.dump({
-                    "trusted": list(self.trusted_names),
-                    "dangerous": list(self.dangerous_names),
-                    "ignored": list(self.ignored_names)
-                }, f, indent=2)
+            if not self._dir_ready:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._dir_ready = True
+            with self._lock:
+                # Same on-disk layout as before: one list per tag
+                payload = {
+                    "trusted": [n for n, tag in self.names.items() if tag & TRUSTED],
+                    "dangerous": [n for n, tag in self.names.items() if tag & DANGEROUS],
+                    "ignored": [n for n, tag in self.names.items() if tag & IGNORED]
+                }
+            if orjson is not None:
+                data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(payload, indent=2).encode("utf-8")
+            # Write a sibling file and swap it in so a crash mid-write can't truncate the real one
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
         except Exception as e:
             print(f"[Guardian] Failed to save memory: {e}")
+            self._dir_ready = False
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
-    def mark_trusted(self, name):
-        self.trusted_names.add(name)
-        self.dangerous_names.discard(name)
-        self.ignored_names.discard(name)
+    def _schedule_save(self):
+        """Coalesce a burst of mark_* calls into one save shortly after (caller holds the lock)"""
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self._save_delay, self._deferred_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _deferred_save(self):
+        with self._lock:
+            self._save_timer = None
         self.save()
 
+    def flush(self):
+        """Save now if a debounced save is still pending"""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+            self.save()
+
+    def mark_trusted(self, name):
+        with self._lock:
+            self.names[name] = TRUSTED
+            self._schedule_save()
+
     def mark_dangerous(self, name):
-        self.dangerous_names.add(name)
-        self.trusted_names.discard(name)
-        self.ignored_names.discard(name)
-        self.save()
+        with self._lock:
+            self.names[name] = DANGEROUS
+            self._schedule_save()
 
     def mark_ignored(self, name):
-        self.ignored_names.add(name)
-        self.save()
+        with self._lock:
+            self.names[name] = self.names.get(name, 0) | IGNORED
+            self._schedule_save()
 
     def is_trusted(self, name):
-        return name in self.trusted_names
+        return self.names.get(name, 0) & TRUSTED != 0
 
     def is_dangerous(self, name):
-        return name in self.dangerous_names
+        return self.names.get(name, 0) & DANGEROUS != 0
 
     def is_ignored(self, name):
-        return name in self.ignored_names
+        return self.names.get(name, 0) & IGNORED != 0
 
     def clear_all_data(self):
-        self.trusted_names = set()
-        self.dangerous_names = set()
-        self.ignored_names = set()
+        with self._lock:
+            self.names = {}
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
         if os.path.exists(self.path):
             try:
                 os.remove(self.path)
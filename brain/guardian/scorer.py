@@ -1,3 +1,12 @@
+from bisect import bisect_left
+
+from guardian.anomaly import AnomalyType
+from guardian.memory import DANGEROUS, TRUSTED
+
+# Upper bound (inclusive) of each escalation level; anything above the last is the final level
+_LEVEL_BOUNDS = (4, 7, 10, 14)
+_LEVELS = ("Observe", "Inform", "Warn", "Recommend", "Request Confirmation")
+
 class RiskScorer:
     """
     Weighted Risk Scoring Engine (Level 2)
@@ -6,6 +15,7 @@ class RiskScorer:
     def __init__(self, memory=None):
         self.memory = memory # Reference to GuardianMemory (Phase 11.1)
         self.scores = {} # PID -> current_score
+        self.last_primary = {} # PID -> most severe anomaly of its latest scored tick (for verdicts)
         
         # Level 2 Weights
         self.weights = {
@@ -16,6 +26,8 @@ class RiskScorer:
             "CHILD_EXPLOSION": 4,
             "RESTART_LOOP": 3
         }
+        # Same weights indexed by AnomalyType for the per-tick lookup
+        self._weight_table = tuple(self.weights.get(t.name, 1) for t in AnomalyType)
         
         # Penalties/Boosts
         self.TRUSTED_PENALTY = -25
@@ -28,28 +40,41 @@ class RiskScorer:
         """
         Calculates and updates the risk score for a process.
         """
-        if pid not in self.scores:
-            self.scores[pid] = 0.0
+        score = self.scores.get(pid, 0.0)
 
-        # 1. Base Score calculation from current anomalies
+        # 1. Base Score calculation from current anomalies (most ticks have none)
         turn_score = 0
-        for a in anomalies:
-            turn_score += self.weights.get(a["type"], 1)
+        if anomalies:
+            # Same pass picks the primary anomaly (first of the highest severity, like max())
+            weights = self._weight_table
+            primary = None
+            best = None
+            for a in anomalies:
+                turn_score += weights[a["type_id"]]
+                severity = a["severity_score"]
+                if best is None or severity > best:
+                    best = severity
+                    primary = a
+            self.last_primary[pid] = primary
+        else:
+            self.last_primary.pop(pid, None)
 
         # 2. Accumulate or Decay
         if turn_score > 0:
-            self.scores[pid] += turn_score
+            score += turn_score
         else:
             # Decay score if no anomalies found this turn
-            self.scores[pid] = max(0.0, self.scores[pid] - self.DECAY_RATE)
+            score = max(0.0, score - self.DECAY_RATE)
+        self.scores[pid] = score
 
         # 3. Apply Multipliers (Trusted / User)
-        final_score = self.scores[pid]
+        final_score = score
         
         if self.memory:
-            if self.memory.is_trusted(process_name):
+            tag = self.memory.names.get(process_name, 0)  # one lookup for both checks
+            if tag & TRUSTED:
                 final_score += self.TRUSTED_PENALTY
-            elif self.memory.is_dangerous(process_name):
+            elif tag & DANGEROUS:
                 final_score += 10 # Bonus for known threats
         
         # Clamp score to reasonable range
@@ -61,21 +86,14 @@ class RiskScorer:
         """
         Maps score to Level 2 Escalation Thresholds.
         """
-        if score <= 4:
-            return "Observe"
-        elif score <= 7:
-            return "Inform"
-        elif score <= 10:
-            return "Warn"
-        elif score <= 14:
-            return "Recommend"
-        else:
-            return "Request Confirmation"
+        return _LEVELS[bisect_left(_LEVEL_BOUNDS, score)]
 
     def cleanup(self, active_pids):
         """
         Cleanup scores for PIDs that have ended.
         """
-        dead_pids = [pid for pid in self.scores if pid not in active_pids]
-        for pid in dead_pids:
+        if not isinstance(active_pids, (set, frozenset)):
+            active_pids = set(active_pids)
+        for pid in self.scores.keys() - active_pids:
             del self.scores[pid]
+            self.last_primary.pop(pid, None)
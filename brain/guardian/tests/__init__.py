@@ -0,0 +1 @@
+# Guardian tests
@@ -0,0 +1,114 @@
+"""
+Tests for the guardian audit trail
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add brain/ to path so guardian.* imports resolve
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from guardian import audit
+from guardian.audit import AuditEngine
+
+
+class TestAuditEngine(unittest.TestCase):
+    """Test JSON-Lines storage, compaction and history of the audit trail."""
+
+    def setUp(self):
+        """Set up a trail in a temp directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "guardian", "audit.jsonl")
+        self.engines = []
+
+    def tearDown(self):
+        """Close any append handles before the temp directory goes."""
+        for engine in self.engines:
+            if engine._fh is not None:
+                engine._fh.close()
+                engine._fh = None
+        self.tmp.cleanup()
+
+    def _engine(self):
+        # Long flush interval: tests control when buffered lines hit the disk
+        engine = AuditEngine(persistence_path=self.path, flush_interval=3600)
+        self.engines.append(engine)
+        return engine
+
+    def _file_events(self):
+        with open(self.path, "rb") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_history_includes_unflushed_appends(self):
+        """Events still in the write buffer show up in get_history."""
+        engine = self._engine()
+        engine.log_event("Alert", "a.exe", "first", now=1.0)
+        engine.log_event("Alert", "b.exe", "second", now=2.0)
+        engine.log_event("Intervention", "a.exe", "third", now=3.0)
+
+        history = engine.get_history()
+        self.assertEqual([e["details"] for e in history], ["first", "second", "third"])
+        self.assertEqual([e["details"] for e in engine.get_history("a.exe")], ["first", "third"])
+
+        # Once loaded, later events are tracked in memory too
+        engine.log_event("System", "b.exe", "fourth", now=4.0)
+        self.assertEqual([e["details"] for e in engine.get_history("b.exe")], ["second", "fourth"])
+
+    def test_history_after_restart(self):
+        """A new engine reads back what the previous one flushed."""
+        engine = self._engine()
+        engine.log_event("Alert", "a.exe", "kept", now=1.0)
+        engine.flush()
+
+        reopened = self._engine()
+        self.assertEqual([e["details"] for e in reopened.get_history("a.exe")], ["kept"])
+
+    def test_compaction_keeps_last_max_events(self):
+        """The file is rewritten as the newest MAX_EVENTS once COMPACT_EVERY lines were appended."""
+        with mock.patch.object(audit, "MAX_EVENTS", 5), mock.patch.object(audit, "COMPACT_EVERY", 12):
+            engine = self._engine()
+            for i in range(13):
+                engine.log_event("Alert", f"p{i % 2}.exe", i, now=float(i))
+
+            self.assertEqual([e["details"] for e in self._file_events()], [8, 9, 10, 11, 12])
+            self.assertEqual([e["details"] for e in engine.get_history()], [8, 9, 10, 11, 12])
+            self.assertEqual([e["details"] for e in engine.get_history("p0.exe")], [8, 10, 12])
+            self.assertEqual(engine._appends, 0)
+
+    def test_index_drops_evicted_events(self):
+        """The per-process index forgets events that fall out of the window."""
+        with mock.patch.object(audit, "MAX_EVENTS", 3):
+            engine = self._engine()
+            engine.get_history()  # load now so every event goes through the index
+            for i in range(5):
+                engine.log_event("Alert", "only.exe" if i == 0 else "other.exe", i, now=float(i))
+
+            self.assertEqual(engine.get_history("only.exe"), [])
+            self.assertNotIn("only.exe", engine._by_process)
+            self.assertEqual([e["details"] for e in engine.get_history("other.exe")], [2, 3, 4])
+
+    def test_legacy_json_array_is_migrated(self):
+        """A trail saved as one JSON array is read and rewritten as JSON Lines."""
+        legacy_events = [
+            {"timestamp": float(i), "type": "Alert", "process": "old.exe", "details": i}
+            for i in range(3)
+        ]
+        os.makedirs(os.path.dirname(self.path))
+        with open(os.path.join(os.path.dirname(self.path), "audit.json"), "w") as f:
+            json.dump(legacy_events, f)
+
+        engine = self._engine()
+        self.assertEqual(engine.get_history(), legacy_events)
+        self.assertFalse(os.path.exists(self.path))
+
+        # The first new event rewrites the trail in the new format
+        engine.log_event("System", "new.exe", "after", now=10.0)
+        self.assertEqual([e["details"] for e in self._file_events()], [0, 1, 2, "after"])
+
+
+if __name__ == '__main__':
+    unittest.main()
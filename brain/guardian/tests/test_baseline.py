@@ -0,0 +1,90 @@
+"""
+Tests for the guardian baseline engine
+"""
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+# Add brain/ to path so guardian.* imports resolve
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from guardian import baseline
+from guardian.baseline import BaselineEngine
+
+
+class TestUpdateMany(unittest.TestCase):
+    """update_many must leave baselines exactly as sequential update() calls would."""
+
+    def setUp(self):
+        """Set up two engines fed the same history."""
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "baselines.json")
+        self.batched = BaselineEngine(persistence_path=path)
+        self.sequential = BaselineEngine(persistence_path=path)
+        self.rng = random.Random(7)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.tmp.cleanup()
+
+    def _tick(self, names):
+        return (
+            names,
+            [self.rng.uniform(0, 100) for _ in names],
+            [self.rng.uniform(10, 2000) for _ in names],
+            [self.rng.randint(0, 8) for _ in names],
+            [self.rng.uniform(0, 500) for _ in names],
+            [self.rng.uniform(0, 500) for _ in names],
+        )
+
+    def _apply(self, tick, now):
+        self.batched.update_many(*tick, now=now)
+        for row in zip(*tick):
+            self.sequential.update(*row, now=now)
+
+    def _assert_same(self):
+        self.assertEqual(self.batched.baselines.keys(), self.sequential.baselines.keys())
+        for name, expected in self.sequential.baselines.items():
+            if name == "_metadata":
+                continue
+            actual = self.batched.baselines[name].to_dict()
+            for field, value in expected.to_dict().items():
+                self.assertAlmostEqual(actual[field], value, places=9, msg=f"{name}.{field}")
+
+    def _run_ticks(self):
+        known = [f"proc{i}.exe" for i in range(baseline._MIN_BATCH + 8)]
+        self._apply(self._tick(known), now=1.0)
+        for t in range(2, 6):
+            # Known names, a repeated name and a first sighting in the same tick
+            names = known + [known[3], f"new{t}.exe"]
+            self._apply(self._tick(names), now=float(t))
+        self._assert_same()
+
+    @unittest.skipIf(baseline.np is None, "NumPy not installed")
+    def test_vectorized_matches_sequential(self):
+        """The NumPy path gives the same averages, peaks, counts and timestamps."""
+        self._run_ticks()
+
+    def test_loop_matches_sequential(self):
+        """Without NumPy, update_many falls back to update() row by row."""
+        saved = baseline.np
+        baseline.np = None
+        try:
+            self._run_ticks()
+        finally:
+            baseline.np = saved
+
+    def test_small_tick_matches_sequential(self):
+        """Ticks below the batch size take the plain loop."""
+        names = ["a.exe", "b.exe", "a.exe"]
+        self._apply(self._tick(names), now=1.0)
+        self._apply(self._tick(names), now=2.0)
+        self._assert_same()
+        self.assertEqual(self.batched.baselines["a.exe"].samples, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests for guardian behavioral chains
+"""
+
+import os
+import sys
+import unittest
+from collections import Counter
+
+# Add brain/ to path so guardian.* imports resolve
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from guardian.anomaly import AnomalyType
+from guardian.chain import BehavioralChain
+
+
+class TestBehavioralChain(unittest.TestCase):
+    """The running type counter must follow the events inside the window."""
+
+    def setUp(self):
+        """Set up a chain with the default 300s window."""
+        self.chain = BehavioralChain(1234, "test.exe")
+
+    def _assert_counts_match_events(self):
+        self.assertEqual(self.chain._counts, Counter(t for _, t in self.chain.events))
+
+    def test_exfiltration_pattern(self):
+        """Spawn, CPU and network anomalies inside the window score 2.5."""
+        self.chain.add_event(AnomalyType.CHILD_EXPLOSION, now=0.0)
+        self.chain.add_event(AnomalyType.CPU_DEVIATION, now=100.0)
+        self.chain.add_event(AnomalyType.NETWORK_BURST, now=200.0)
+        self.assertEqual(self.chain.suspicion_multiplier, 2.5)
+        self._assert_counts_match_events()
+
+    def test_expired_events_leave_the_counter(self):
+        """Once an event ages out, its type no longer counts toward patterns."""
+        self.chain.add_event(AnomalyType.CHILD_EXPLOSION, now=0.0)
+        self.chain.add_event(AnomalyType.CPU_DEVIATION, now=100.0)
+        self.chain.add_event(AnomalyType.NETWORK_BURST, now=300.0)  # first event expires here
+
+        self.assertNotIn(AnomalyType.CHILD_EXPLOSION, self.chain._counts)
+        self.assertAlmostEqual(self.chain.suspicion_multiplier, 1.2)
+        self._assert_counts_match_events()
+
+    def test_repeated_types(self):
+        """Counts track repeats; more than two child explosions score 1.8."""
+        for t in (0.0, 10.0, 20.0):
+            self.chain.add_event(AnomalyType.CHILD_EXPLOSION, now=t)
+        self.assertEqual(self.chain._counts[AnomalyType.CHILD_EXPLOSION], 3)
+        self.assertEqual(self.chain.suspicion_multiplier, 1.8)
+
+        # Two of the three age out, leaving a single type in the window
+        self.chain.add_event(AnomalyType.MEMORY_LEAK, now=315.0)
+        self.assertEqual(self.chain._counts[AnomalyType.CHILD_EXPLOSION], 1)
+        self.assertAlmostEqual(self.chain.suspicion_multiplier, 1.2)
+        self._assert_counts_match_events()
+
+    def test_hijack_pattern(self):
+        """A memory anomaly plus a restart loop scores 2.0."""
+        self.chain.add_event(AnomalyType.MEMORY_EXPLOSION, now=0.0)
+        self.chain.add_event(AnomalyType.RESTART_LOOP, now=5.0)
+        self.assertEqual(self.chain.suspicion_multiplier, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
-def generate_verdicts(process_name, pid, score, anomalies, level, confidence):
+def generate_verdicts(process_name, pid, score, anomalies, level, confidence, primary=None):
     """
     Guardian Explainability Engine (Level 2)
     Converts raw anomalies and scores into structured, human-readable verdicts.
+    primary: most severe anomaly if the caller already knows it (RiskScorer.last_primary).
     """
     if not anomalies or not level:
         return []
@@ -19,7 +20,7 @@ def generate_verdicts(process_name, pid, score, anomalies, level, confidence):
     behaviors = list(set([a["type"] for a in anomalies]))
     
     # Primary reason (usually the most severe anomaly)
-    primary_anomaly = max(anomalies, key=lambda a: a["severity_score"])
+    primary_anomaly = primary if primary is not None else max(anomalies, key=lambda a: a["severity_score"])
     
     verdict = {
         "level": level,
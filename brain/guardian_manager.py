@@ -22,7 +22,7 @@ GUARDIAN_FINGERPRINTS = FingerprintManager()
 GUARDIAN_CHAINS = ChainManager()
 GUARDIAN_STATE = GuardianState()
 GUARDIAN_INTERVENTION = InterventionEngine()
-GUARDIAN_AUDIT = AuditEngine(persistence_path="fluffy_data/guardian/audit.json")
+GUARDIAN_AUDIT = AuditEngine(persistence_path="fluffy_data/guardian/audit.jsonl")
 
 def reset_guardian():
     """
@@ -54,9 +54,9 @@ def reset_guardian():
             state.LATEST_STATE["_insights"] = [i for i in state.LATEST_STATE.get("_insights", []) if "[Guardian]" not in i]
 
     # 4. Force clear data files to ensure they are empty on disk
+    # (the JSON-Lines audit trail was already truncated by GUARDIAN_AUDIT.clear_all_data())
     files_to_clear = {
         "status.json": {},
-        "fluffy_data/guardian/audit.json": [],
         "fluffy_data/guardian/memory.json": {},
         "fluffy_data/guardian/baselines.json": {"_metadata": {"system_first_run": int(time.time())}}
     }
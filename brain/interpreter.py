@@ -1,9 +1,11 @@
 from alerts import memory_pressure_message, cpu_pressure_message
 import time
+from collections import deque
 
 # Simple in-memory tracking for cooldowns and history
+# Histories are deques of timestamped samples, oldest first; pruned from the left
 _last_emit = {}
-_system_history = {"cpu": [], "ram": []}
+_system_history = {"cpu": deque(), "ram": deque()}
 _process_history = {}
 
 def should_emit(key: str, cooldown_seconds: int) -> bool:
@@ -18,37 +20,47 @@ def should_emit(key: str, cooldown_seconds: int) -> bool:
 def push_system_stats(cpu: float, ram: float):
     """Track system stats for trend analysis"""
     now = time.time()
-    _system_history["cpu"].append((now, cpu))
-    _system_history["ram"].append((now, ram))
+    cpu_hist = _system_history["cpu"]
+    ram_hist = _system_history["ram"]
+    cpu_hist.append((now, cpu))
+    ram_hist.append((now, ram))
     
     # Keep only last 10 minutes
     cutoff = now - 600
-    _system_history["cpu"] = [(t, v) for t, v in _system_history["cpu"] if t > cutoff]
-    _system_history["ram"] = [(t, v) for t, v in _system_history["ram"] if t > cutoff]
+    while cpu_hist[0][0] <= cutoff:
+        cpu_hist.popleft()
+    while ram_hist[0][0] <= cutoff:
+        ram_hist.popleft()
 
 def push_process_stats(name: str, cpu: float, ram: float):
     """Track process stats for leak detection"""
-    if name not in _process_history:
-        _process_history[name] = []
+    history = _process_history.get(name)
+    if history is None:
+        history = _process_history[name] = deque()
     
     now = time.time()
-    _process_history[name].append((now, cpu, ram))
+    history.append((now, cpu, ram))
     
     # Keep only last 10 minutes
     cutoff = now - 600
-    _process_history[name] = [(t, c, r) for t, c, r in _process_history[name] if t > cutoff]
+    while history[0][0] <= cutoff:
+        history.popleft()
 
 def is_system_consistently_above(seconds: int, threshold: float, metric: str = "cpu") -> bool:
     """Check if system metric has been above threshold for duration"""
     now = time.time()
     cutoff = now - seconds
-    history = _system_history.get(metric, [])
-    
-    recent = [(t, v) for t, v in history if t > cutoff]
-    if not recent:
-        return False
+    history = _system_history.get(metric, ())
     
-    return all(v > threshold for _, v in recent)
+    # Walk newest to oldest and stop at the first sample outside the window
+    seen = False
+    for t, v in reversed(history):
+        if t <= cutoff:
+            break
+        if v <= threshold:
+            return False
+        seen = True
+    return seen
 
 def detect_process_leak(name: str, seconds: int, threshold_mb: float) -> bool:
     """Detect if process RAM is strictly increasing (potential leak)"""
@@ -57,15 +69,18 @@ def detect_process_leak(name: str, seconds: int, threshold_mb: float) -> bool:
     
     now = time.time()
     cutoff = now - seconds
-    history = [(t, c, r) for t, c, r in _process_history[name] if t > cutoff]
+    ram_values = []  # newest first
+    for t, _, r in reversed(_process_history[name]):
+        if t <= cutoff:
+            break
+        ram_values.append(r)
     
-    if len(history) < 3:
+    if len(ram_values) < 3:
         return False
     
-    # Check if RAM is increasing and delta > threshold
-    ram_values = [r for _, _, r in history]
-    is_increasing = all(ram_values[i] < ram_values[i+1] for i in range(len(ram_values)-1))
-    delta = ram_values[-1] - ram_values[0]
+    # Check if RAM is increasing and delta > threshold (i.e. decreasing going back in time)
+    is_increasing = all(ram_values[i] > ram_values[i+1] for i in range(len(ram_values)-1))
+    delta = ram_values[0] - ram_values[-1]
     
     return is_increasing and delta > threshold_mb
 
@@ -76,9 +91,13 @@ def count_process_spikes(name: str, seconds: int, threshold_cpu: float) -> int:
     
     now = time.time()
     cutoff = now - seconds
-    history = [(t, c, r) for t, c, r in _process_history[name] if t > cutoff]
-    
-    return sum(1 for _, cpu, _ in history if cpu > threshold_cpu)
+    spikes = 0
+    for t, cpu, _ in reversed(_process_history[name]):
+        if t <= cutoff:
+            break
+        if cpu > threshold_cpu:
+            spikes += 1
+    return spikes
 
 def interpret(message):
     signals = message.get("signals", {})
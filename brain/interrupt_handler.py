@@ -3,6 +3,7 @@ Interrupt command handler for Fluffy Assistant
 Allows users to cancel pending actions with commands like "stop", "cancel", etc.
 """
 
+import re
 import state
 import time
 
@@ -12,14 +13,16 @@ INTERRUPT_COMMANDS = [
     "mute", "quiet", "shut up", "never mind", "forget it"
 ]
 
+# All keywords in one case-insensitive pass; word boundaries keep "quite" or "stopwatch" from matching
+_INTERRUPT_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, INTERRUPT_COMMANDS)) + r")\b",
+    re.IGNORECASE
+)
+
 
 def is_interrupt_command(text: str) -> bool:
     """Check if text contains an interrupt command"""
-    if not text:
-        return False
-    
-    text_lower = text.lower().strip()
-    return any(cmd in text_lower for cmd in INTERRUPT_COMMANDS)
+    return bool(text and _INTERRUPT_RE.search(text))
 
 
 def handle_interrupt() -> dict:
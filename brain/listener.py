@@ -236,10 +236,11 @@ def handle_message(raw_msg, monitor):
     global GUARDIAN_TICK_COUNTER
     GUARDIAN_TICK_COUNTER += 1
     run_full_guardian = (GUARDIAN_TICK_COUNTER % GUARDIAN_FULL_INTERVAL == 0)
+    now = time.time()  # one timestamp for every Guardian update this tick
 
     all_guardian_verdicts = []
     processes = msg.get("system", {}).get("processes", {}).get("top_ram", [])
-    active_pids = [p["pid"] for p in processes]
+    active_pids = {p["pid"] for p in processes}  # a set, so the cleanups below take it as-is
     
     current_scores = {}
     
@@ -250,7 +251,23 @@ def handle_message(raw_msg, monitor):
     # Throttle: full analysis every 3rd tick, lightweight (top 20) on other ticks
     analysis_processes = processes if run_full_guardian else processes[:20]
 
+    # 1. Update / Load Fingerprints and 2. Get Baselines for the whole tick
+    fingerprints = []
+    baselines = []
     for p in analysis_processes:
+        fingerprints.append(GUARDIAN_FINGERPRINTS.track(
+            p["pid"], p["name"], p["cpu_percent"], p["ram_mb"],
+            p.get("net_sent", 0.0), p.get("net_received", 0.0), len(p.get("children", [])), now
+        ))
+        baselines.append(GUARDIAN_BASELINE.get_baseline(p["name"]))
+    
+    # 3. Detect Anomalies (one vectorized pass when NumPy is available)
+    all_anomalies = GUARDIAN_DETECTOR.analyze_batch(fingerprints, baselines)
+
+    # Baseline observations for the tick, applied in one batch after the loop
+    upd_names, upd_cpu, upd_ram, upd_children, upd_sent, upd_recv = [], [], [], [], [], []
+
+    for p, baseline, anomalies in zip(analysis_processes, baselines, all_anomalies):
         pid = p["pid"]
         name = p["name"]
         cpu = p["cpu_percent"]
@@ -259,17 +276,8 @@ def handle_message(raw_msg, monitor):
         net_received = p.get("net_received", 0.0)
         child_count = len(p.get("children", []))
         
-        # 1. Update / Load Fingerprint
-        fp = GUARDIAN_FINGERPRINTS.track(pid, name, cpu, ram, net_sent, net_received, child_count)
-        
-        # 2. Get Baseline
-        baseline = GUARDIAN_BASELINE.get_baseline(name)
-        
-        # 3. Detect Anomalies
-        anomalies = GUARDIAN_DETECTOR.analyze(fp, baseline)
-        
         # 4. Behavioral Chain Tracking
-        chain_multiplier = GUARDIAN_CHAINS.update(pid, name, anomalies)
+        chain_multiplier = GUARDIAN_CHAINS.update(pid, name, anomalies, now)
         
         # 5. Risk Scoring
         risk_score = GUARDIAN_SCORER.score(name, pid, anomalies) * chain_multiplier
@@ -281,11 +289,12 @@ def handle_message(raw_msg, monitor):
         # Verdict Generation (Suppressed during initial 5-min Learning Mode)
         if not is_learning:
             # Skip verdict generation for trusted processes
-            if baseline and baseline.get("trusted", False):
+            if baseline and baseline.trusted:
                 # Process is trusted - no alerts needed
                 continue
             
-            verdicts = generate_verdicts(name, pid, risk_score, anomalies, level, 0.8)
+            verdicts = generate_verdicts(name, pid, risk_score, anomalies, level, 0.8,
+                                         GUARDIAN_SCORER.last_primary.get(pid))
             all_guardian_verdicts.extend(verdicts)
             
             # Voice alert for serious verdicts with metrics (lazy loaded)
@@ -301,7 +310,7 @@ def handle_message(raw_msg, monitor):
             
             # Audit logging
             if anomalies:
-                 GUARDIAN_AUDIT.log_event("BehaviorAlert", name, {"score": risk_score, "level": level, "anomalies": anomalies})
+                 GUARDIAN_AUDIT.log_event("BehaviorAlert", name, {"score": risk_score, "level": level, "anomalies": [a._asdict() for a in anomalies]}, now)
 
             # Confirmation Logic (Level: Request Confirmation) -> Only if not learning
             if level == "Request Confirmation" and name not in PROACTIVE_PROMPTS:
@@ -309,14 +318,21 @@ def handle_message(raw_msg, monitor):
                 v = verdicts[0] if verdicts else {"reason": "Undetermined risk", "explanation": "High suspicion score"}
                 details_str = f"Guardian Alert: {v['reason']}\n{v['explanation']}\n\nThis process has exceeded the safety threshold (Score: {risk_score:.1f}). Should Fluffy terminate it?"
                 state.add_confirmation(
-                    cmd_id=f"kill_{pid}_{int(time.time())}",
+                    cmd_id=f"kill_{pid}_{int(now)}",
                     cmd_name="Terminate Suspicious Process",
                     details=details_str
                 )
                 add_execution_log(f"Guardian requesting confirmation to terminate {name}", "action")
 
-        # 7. Update Baseline (Slow adaptation)
-        GUARDIAN_BASELINE.update(name, cpu, ram, child_count, net_sent, net_received)
+        # 7. Queue Baseline update (Slow adaptation)
+        upd_names.append(name)
+        upd_cpu.append(cpu)
+        upd_ram.append(ram)
+        upd_children.append(child_count)
+        upd_sent.append(net_sent)
+        upd_recv.append(net_received)
+
+    GUARDIAN_BASELINE.update_many(upd_names, upd_cpu, upd_ram, upd_children, upd_sent, upd_recv, now)
 
     # Global State Update
     GUARDIAN_STATE.update(current_scores)
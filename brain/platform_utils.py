@@ -7,29 +7,59 @@ the rest of the brain code can remain platform-independent.
 Supported platforms: Windows, Linux (Kali Linux).
 """
 
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import platform
 import subprocess
 import os
 import shutil
 from pathlib import Path
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 IS_WINDOWS = platform.system() == "Windows"
 IS_LINUX = platform.system() == "Linux"
 
+# Single background worker for file-manager windows, so callers never wait
+# on process spawn latency
+_UI_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fluffy-ui")
+
 
 # ============================================================================
 # FILE / FOLDER OPERATIONS
 # ============================================================================
 
+def _spawn_detached(args):
+    """Start a UI helper process without waiting for it (runs on _UI_EXECUTOR)."""
+    try:
+        if IS_WINDOWS:
+            subprocess.Popen(args, close_fds=True, creationflags=subprocess.DETACHED_PROCESS)
+        else:
+            subprocess.Popen(args, close_fds=True, start_new_session=True)
+    except Exception as e:
+        print(f"[platform_utils] Failed to launch {args[0]}: {e}")
+
+
+def _shell_open(path):
+    """Open a path through the existing Explorer shell (Windows, runs on _UI_EXECUTOR)."""
+    try:
+        os.startfile(path)
+    except Exception as e:
+        print(f"[platform_utils] Failed to open {path}: {e}")
+
+
 def open_file_in_explorer(path: str):
     """Open the file manager and highlight/select the given file."""
     path = str(path)
     if IS_WINDOWS:
-        subprocess.run(['explorer', '/select,', path])
+        _UI_EXECUTOR.submit(_spawn_detached, ['explorer', '/select,', path])
     elif IS_LINUX:
         # xdg-open opens the containing directory
         parent = os.path.dirname(path)
-        subprocess.Popen(['xdg-open', parent])
+        _UI_EXECUTOR.submit(_spawn_detached, ['xdg-open', parent])
     else:
         print(f"[platform_utils] Unsupported OS for open_file_in_explorer: {platform.system()}")
 
@@ -38,9 +68,10 @@ def open_folder(path: str):
     """Open a folder in the system file manager."""
     path = str(path)
     if IS_WINDOWS:
-        subprocess.run(['explorer', path])
+        # ShellExecute reuses the running shell instead of forking explorer.exe
+        _UI_EXECUTOR.submit(_shell_open, path)
     elif IS_LINUX:
-        subprocess.Popen(['xdg-open', path])
+        _UI_EXECUTOR.submit(_spawn_detached, ['xdg-open', path])
     else:
         print(f"[platform_utils] Unsupported OS for open_folder: {platform.system()}")
 
@@ -60,12 +91,50 @@ def open_file(path: str):
 # PROCESS MANAGEMENT
 # ============================================================================
 
+def _psutil_kill_by_name(name: str):
+    """In-process kill by name (no taskkill/pkill spawn). Same matching rules."""
+    if IS_WINDOWS:
+        target = name.lower() if name.lower().endswith('.exe') else f"{name.lower()}.exe"
+    else:
+        target = name.replace('.exe', '').lower()
+
+    own_pid = os.getpid()
+    killed, denied = 0, 0
+    for proc in psutil.process_iter(['name', 'cmdline']):
+        if proc.pid == own_pid:
+            continue
+        proc_name = (proc.info['name'] or '').lower()
+        if IS_WINDOWS:
+            match = proc_name == target
+        else:
+            # Mirror `pkill -f`: match against the full command line
+            cmdline = ' '.join(proc.info['cmdline'] or ()).lower()
+            match = proc_name == target or target in cmdline
+        if not match:
+            continue
+        try:
+            proc.kill()
+            killed += 1
+        except psutil.NoSuchProcess:
+            pass
+        except psutil.AccessDenied:
+            denied += 1
+
+    if killed:
+        return True, f"Killed {killed} process(es) matching {name}"
+    if denied:
+        return False, f"Access denied killing {name}"
+    return False, f"No running process matching {name}"
+
+
 def kill_process_by_name(name: str):
     """
     Kill a process by its name. Returns (success: bool, message: str).
     On Windows, appends .exe if not present.
     """
     try:
+        if psutil is not None and (IS_WINDOWS or IS_LINUX):
+            return _psutil_kill_by_name(name)
         if IS_WINDOWS:
             if not name.lower().endswith('.exe'):
                 name = f"{name}.exe"
@@ -94,6 +163,9 @@ def kill_process_by_pid(pid):
     Kill a process by PID. Returns (success: bool, message: str).
     """
     try:
+        if psutil is not None:
+            psutil.Process(int(pid)).kill()
+            return True, f"Killed process {pid}"
         if IS_WINDOWS:
             result = subprocess.run(
                 ["taskkill", "/PID", str(pid), "/F"],
@@ -141,15 +213,31 @@ def get_system_commands():
         return {}
 
 
+def run_native_system_command(action: str) -> bool:
+    """
+    Perform lock/sleep through the Win32 API instead of spawning rundll32.
+    Returns True if the action was handled; False means the caller should
+    fall back to the command line from get_system_commands().
+    """
+    if not IS_WINDOWS:
+        return False
+    try:
+        if action == "lock":
+            return bool(ctypes.windll.user32.LockWorkStation())
+        if action == "sleep":
+            # Same arguments as the rundll32 form: hibernate=0, force=1, disable wake=0
+            return bool(ctypes.windll.powrprof.SetSuspendState(0, 1, 0))
+    except Exception as e:
+        print(f"[platform_utils] Native {action} failed: {e}")
+    return False
+
+
 # ============================================================================
 # APPLICATION DISCOVERY (for command_executor app paths)
 # ============================================================================
 
-def get_common_app_paths():
-    """
-    Return a dict of common application names → executable paths for the
-    current platform. Used as fallback when shutil.which() fails.
-    """
+def _build_common_app_paths():
+    """Platform-specific table behind get_common_app_paths()."""
     if IS_WINDOWS:
         return {
             "chrome": r"C:\Program Files\Google\Chrome\Application\chrome.exe",
@@ -190,15 +278,37 @@ def get_common_app_paths():
     return {}
 
 
+# Built once at import; the table is static per platform
+_COMMON_APP_PATHS = _build_common_app_paths()
+
+
+def get_common_app_paths():
+    """
+    Return a dict of common application names → executable paths for the
+    current platform. Used as fallback when shutil.which() fails.
+    """
+    return dict(_COMMON_APP_PATHS)
+
+
 def find_app_executable(app_name: str):
     """
     Try to find an app executable. Returns the path string or None.
     Uses platform-specific known paths, then falls back to shutil.which().
+    Results are memoized; see clear_app_cache().
     """
-    app_lower = app_name.lower().strip()
+    return _resolve_app(app_name.lower().strip())
+
+
+def clear_app_cache():
+    """Forget memoized app lookups (e.g. after an app is installed or removed)."""
+    _resolve_app.cache_clear()
+
 
+@functools.lru_cache(maxsize=256)
+def _resolve_app(app_lower: str):
+    """Memoized lookup behind find_app_executable (expects a normalized name)."""
     # 1. Check known paths
-    known = get_common_app_paths()
+    known = _COMMON_APP_PATHS
     if app_lower in known:
         path = known[app_lower]
         if os.path.exists(path):
@@ -232,6 +342,80 @@ def launch_executable(path: str):
         subprocess.Popen([path])
 
 
+# ============================================================================
+# KEYBOARD INPUT (Windows SendInput fast path)
+# ============================================================================
+
+if IS_WINDOWS:
+    import ctypes
+    from ctypes import wintypes
+
+    _INPUT_KEYBOARD = 1
+    _KEYEVENTF_KEYUP = 0x0002
+    _KEYEVENTF_UNICODE = 0x0004
+    _VK_RETURN = 0x0D
+
+    class _MOUSEINPUT(ctypes.Structure):
+        _fields_ = [
+            ("dx", wintypes.LONG),
+            ("dy", wintypes.LONG),
+            ("mouseData", wintypes.DWORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),
+        ]
+
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [
+            ("wVk", wintypes.WORD),
+            ("wScan", wintypes.WORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),
+        ]
+
+    class _INPUTUNION(ctypes.Union):
+        # MOUSEINPUT is the largest member; it must be present so that
+        # sizeof(INPUT) matches what SendInput expects
+        _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT)]
+
+    class _INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+
+def send_unicode_text(text: str) -> bool:
+    """
+    Type text into the focused window with a single SendInput call.
+    Windows only; returns False when unsupported or when not every
+    event was injected, so callers can fall back to pyautogui.
+    """
+    if not IS_WINDOWS or not text:
+        return False
+
+    events = []
+    data = text.encode("utf-16-le")
+    for i in range(0, len(data), 2):
+        unit = data[i] | (data[i + 1] << 8)
+        if unit == 0x0A:  # newline -> Enter key
+            down = _KEYBDINPUT(wVk=_VK_RETURN)
+            up = _KEYBDINPUT(wVk=_VK_RETURN, dwFlags=_KEYEVENTF_KEYUP)
+        elif unit == 0x0D:
+            continue
+        else:
+            down = _KEYBDINPUT(wScan=unit, dwFlags=_KEYEVENTF_UNICODE)
+            up = _KEYBDINPUT(wScan=unit, dwFlags=_KEYEVENTF_UNICODE | _KEYEVENTF_KEYUP)
+        events.append(_INPUT(type=_INPUT_KEYBOARD, u=_INPUTUNION(ki=down)))
+        events.append(_INPUT(type=_INPUT_KEYBOARD, u=_INPUTUNION(ki=up)))
+
+    batch = (_INPUT * len(events))(*events)
+    try:
+        sent = ctypes.windll.user32.SendInput(len(events), batch, ctypes.sizeof(_INPUT))
+    except Exception as e:
+        print(f"[platform_utils] SendInput failed: {e}")
+        return False
+    return sent == len(events)
+
+
 # ============================================================================
 # SUSPICIOUS PATH PATTERNS (for security_monitor)
 # ============================================================================
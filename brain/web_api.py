@@ -180,7 +180,7 @@ def trust_process():
         return jsonify({"error": "Missing process name"}), 400
     
     from guardian_manager import GUARDIAN_BASELINE
-    import time
+    from guardian.baseline import Baseline
     
     # Add to long-term memory (persists across restarts)
     try:
@@ -192,23 +192,7 @@ def trust_process():
     baseline = GUARDIAN_BASELINE.get_baseline(process_name)
     if not baseline:
         # Create minimal baseline entry for newly trusted process
-        GUARDIAN_BASELINE.baselines[process_name] = {
-            "trusted": True,
-            "samples": 0,
-            "first_seen": time.time(),
-            "last_seen": time.time(),
-            "avg_cpu": 0.0,
-            "peak_cpu": 0.0,
-            "avg_ram": 0.0,
-            "peak_ram": 0.0,
-            "ram_growth_rate": 0.0,
-            "avg_children": 0.0,
-            "child_spawn_rate": 0.0,
-            "avg_net_sent": 0.0,
-            "avg_net_received": 0.0,
-            "avg_lifespan": 0.0,
-            "restart_count": 0
-        }
+        GUARDIAN_BASELINE.baselines[process_name] = Baseline(trusted=True, samples=0)
         GUARDIAN_BASELINE.save()
         state.add_execution_log(f"Manual trust: {process_name} marked as trusted (baseline created + memory saved)", "info")
     else:
@@ -1,5 +1,5 @@
 use std::collections::HashMap;
-use std::io::{BufRead, BufReader};
+use std::io::{BufRead, BufReader, Read};
 use std::net::TcpListener;
 // use std::process::Command;
 use std::sync::Mutex;
@@ -20,14 +20,51 @@ pub fn start_command_server(port: u16) {
     std::thread::spawn(move || {
         for stream in listener.incoming() {
             if let Ok(stream) = stream {
-                let reader = BufReader::new(stream);
-                for line in reader.lines().flatten() {
-                    println!("[Fluffy Core] Received command line: {}", line);
-                    match serde_json::from_str::<IpcCommand>(&line) {
-                        Ok(cmd) => handle_command(cmd),
-                        Err(e) => eprintln!("[Fluffy Core] Failed to parse command: {}", e),
-                    }
-                }
+                // One thread per client: the brain keeps its connection open,
+                // so reading inline would starve other senders (e.g. the UI)
+                std::thread::spawn(move || serve_client(stream));
+            }
+        }
+    });
+
+    #[cfg(unix)]
+    start_unix_command_server();
+}
+
+/// Read newline-delimited JSON commands from one client until it disconnects.
+fn serve_client<S: Read>(stream: S) {
+    let reader = BufReader::new(stream);
+    for line in reader.lines().flatten() {
+        println!("[Fluffy Core] Received command line: {}", line);
+        match serde_json::from_str::<IpcCommand>(&line) {
+            Ok(cmd) => handle_command(cmd),
+            Err(e) => eprintln!("[Fluffy Core] Failed to parse command: {}", e),
+        }
+    }
+}
+
+/// Same protocol over a Unix domain socket, which skips the loopback TCP stack.
+/// The brain prefers it on POSIX and falls back to TCP when it is missing.
+#[cfg(unix)]
+fn start_unix_command_server() {
+    use std::os::unix::net::UnixListener;
+
+    let path = std::env::temp_dir().join("fluffy_core.sock");
+    // A previous run may have left the socket file behind
+    let _ = std::fs::remove_file(&path);
+    let listener = match UnixListener::bind(&path) {
+        Ok(listener) => listener,
+        Err(e) => {
+            eprintln!("[Fluffy Core] Unix command socket unavailable ({}), TCP only", e);
+            return;
+        }
+    };
+    println!("[Fluffy Core] Command server listening on {}", path.display());
+
+    std::thread::spawn(move || {
+        for stream in listener.incoming() {
+            if let Ok(stream) = stream {
+                std::thread::spawn(move || serve_client(stream));
             }
         }
     });